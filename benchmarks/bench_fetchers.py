@@ -0,0 +1,72 @@
+"""
+Mesure le débit des récupérations HAL, ORCID et Scopus sur des profils synthétiques servis par le serveur
+de rejeu local (benchmarks/replay_server.py), sans réseau et sans cache, au rythme des limiteurs de débit.
+
+Utilisation (depuis la racine du projet) :
+    python benchmarks/bench_fetchers.py --works 10000 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Avant l'import de fonction : le cache persistant fausserait les mesures, et l'état partagé des limiteurs
+# de débit ne doit pas garder le quota du serveur local
+os.environ["HTTP_CACHE_PATH"] = ""
+os.environ["RATE_LIMIT_PATH"] = ""
+
+from replay_server import Faults, start_server
+
+from fonction._hal import get_hal_researcher_data
+from fonction._orcid import Orcid_Researcher
+from fonction._scopus import Scopus_Researcher
+
+def measure(server, api_names: list, fetch) -> tuple[float, int, int]:
+    """
+    Chronomètre une récupération.
+
+    Args:
+        server(ThreadingHTTPServer) : serveur de rejeu (compteurs de requêtes par API)
+        api_names(list) : API dont les requêtes sont comptées
+        fetch(callable) : récupération renvoyant un DataFrame
+
+    Return:
+        tuple[float, int, int] : (durée en secondes, nombre de requêtes, nombre de lignes)
+    """
+    stats = server.RequestHandlerClass.stats
+    before = sum(stats.get(api, 0) for api in api_names)
+    start = time.perf_counter()
+    df = fetch()
+    elapsed = time.perf_counter() - start
+    requests_count = sum(stats.get(api, 0) for api in api_names) - before
+    return elapsed, requests_count, 0 if df is None else len(df)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--works", type=int, default=10000, help="nombre de travaux du profil synthétique")
+    parser.add_argument("--latency", type=float, default=0.0, help="latence moyenne par requête en secondes")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="part des requêtes en erreur 503")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requêtes par seconde autorisées par API")
+    args = parser.parse_args()
+
+    server = start_server(faults=Faults(args.latency, args.error_rate, args.rate_limit))
+    os.environ["API_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    identifier = f"synthetic-{args.works}"
+
+    cases = {
+        "HAL": (["hal"], lambda: get_hal_researcher_data(idhal=identifier)),
+        "ORCID (résumés)": (["orcid"], lambda: Orcid_Researcher(f"https://orcid.org/{identifier}").format_df_orcids()),
+        "ORCID (travaux complets)": (["orcid", "orcid-api"],
+                                     lambda: Orcid_Researcher(f"https://orcid.org/{identifier}", full_works=True).format_df_orcids()),
+        "Scopus": (["scopus"], lambda: Scopus_Researcher(f"99{args.works}").get_publication_scopus()),
+    }
+    print(f"{args.works} travaux, latence {args.latency} s, erreurs {args.error_rate:.0%}, limite {args.rate_limit or '-'} req/s")
+    for name, (api_names, fetch) in cases.items():
+        elapsed, requests_count, rows = measure(server, api_names, fetch)
+        print(f"{name:<26} {elapsed:7.2f} s  {requests_count:5d} requêtes  {rows:6d} lignes  {rows / elapsed:9.0f} lignes/s")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
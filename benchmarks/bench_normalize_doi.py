@@ -0,0 +1,73 @@
+"""
+Mesure le débit de la normalisation des DOI sur une colonne synthétique.
+
+Utilisation (depuis la racine du projet) :
+    python benchmarks/bench_normalize_doi.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fonction._identifiers import _doi_memo, normalize_doi_series
+
+# Habillages rencontrés dans les exports HAL, Scopus, ORCID et WoS
+PREFIXES = ["", "doi:", "DOI ", "https://doi.org/", "http://dx.doi.org/", "https://www.doi.org/", "info:doi/"]
+SUFFIXES = ["", "", "", ".", " ", ";"]
+
+def synthetic_dois(rows: int, distinct: float, seed: int = 0) -> pd.Series:
+    """
+    Génère une colonne de DOI bruts avec des préfixes, ponctuations et casses variés.
+
+    Args:
+        rows(int) : nombre de valeurs
+        distinct(float) : part de DOI distincts (les autres sont des répétitions)
+        seed(int) : graine du générateur aléatoire
+
+    Return:
+        pd.Series : DOI bruts
+    """
+    rng = np.random.default_rng(seed)
+    numbers = rng.integers(0, max(1, int(rows * distinct)), rows)
+    bare = pd.Series(numbers).map(lambda n: f"10.{1000 + n % 9000}/J.Test.{n}")
+    prefixes = pd.Series(np.array(PREFIXES)[rng.integers(0, len(PREFIXES), rows)])
+    suffixes = pd.Series(np.array(SUFFIXES)[rng.integers(0, len(SUFFIXES), rows)])
+    return prefixes.str.cat(bare).str.cat(suffixes)
+
+def timed(values: pd.Series) -> float:
+    """
+    Normalise la colonne et renvoie la durée en secondes.
+
+    Args:
+        values(pd.Series) : DOI bruts
+
+    Return:
+        float : durée en secondes
+    """
+    start = time.perf_counter()
+    normalize_doi_series(values)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="nombre de DOI (1 000 000 par défaut)")
+    parser.add_argument("--distinct", type=float, default=0.5, help="part de DOI distincts (0.5 par défaut)")
+    args = parser.parse_args()
+
+    values = synthetic_dois(args.rows, args.distinct)
+
+    _doi_memo.clear()
+    cold = timed(values)
+    warm = timed(values)
+
+    print(f"{args.rows:,} DOI ({values.nunique():,} valeurs brutes distinctes)")
+    print(f"  mémo vide   : {cold:.2f} s  ({args.rows / cold:,.0f} DOI/s)")
+    print(f"  mémo rempli : {warm:.2f} s  ({args.rows / warm:,.0f} DOI/s)")
+
+if __name__ == "__main__":
+    main()
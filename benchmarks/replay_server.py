@@ -0,0 +1,439 @@
+"""
+Serveur local qui remplace les API HAL, ORCID et Scopus, pour mesurer et tester les récupérations sans réseau.
+
+Il sert, dans l'ordre :
+  - les réponses enregistrées (dossier --recordings, alimenté avec --record depuis les vraies API) ;
+  - des profils synthétiques dont la taille est donnée par l'identifiant : idHAL "synthetic-10000",
+    ORCID "synthetic-10000", Scopus ID "99" suivi du nombre de travaux (ex : "9900010000").
+Latence, erreurs serveur, limite de débit et quota (en-têtes X-RateLimit-*) sont injectables.
+
+Utilisation (depuis la racine du projet) :
+    python benchmarks/replay_server.py --port 8765 --latency 0.05 --error-rate 0.02 --rate-limit 9
+    API_BASE_URL=http://127.0.0.1:8765 python -m fonction compare --idhal synthetic-10000 --orcid synthetic-10000 --scopus-id 9900010000
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fonction._cache import cache_key
+from fonction._endpoints import DEFAULT_BASE_URLS
+
+SCOPUS_OFFSET_LIMIT = 5000
+ORCID_BULK_SIZE = 100
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+
+# ---- Profils synthétiques ----
+
+def synthetic_size(identifier: str) -> int:
+    """
+    Nombre de travaux d'un profil synthétique.
+
+    Args:
+        identifier(str) : idHAL, ORCID ou Scopus ID
+
+    Return:
+        int : nombre de travaux, ou None si l'identifiant n'est pas synthétique
+    """
+    match = re.fullmatch(r"synthetic-(\d+)", identifier) or re.fullmatch(r"99(\d+)", identifier)
+    return int(match.group(1)) if match else None
+
+def synthetic_work(i: int) -> dict:
+    """
+    Travail synthétique numéro i. Chaque base n'en contient qu'une partie (HAL 70 %, Scopus 85 %, ORCID 90 %),
+    certains sans DOI, pour que les comparaisons aient des recoupements partiels.
+
+    Args:
+        i(int) : numéro du travail
+
+    Return:
+        dict : métadonnées du travail
+    """
+    year = 2000 + i % 25
+    return {
+        "i": i,
+        "title": f"Synthetic study {i} of visibility in {['oncology', 'physics', 'linguistics', 'ecology'][i % 4]}",
+        "journal": f"Journal of Synthetic Research {i % 97}",
+        "publisher": f"Publisher {i % 13}",
+        "year": year,
+        "display_date": f"{1 + i % 28} {MONTHS[i % 12]} {year}" if i % 6 else f"{MONTHS[i % 12]}-{MONTHS[(i + 1) % 12]} {year}",
+        "doi": f"10.5555/synthetic.{i}" if i % 11 else None,
+        "pmid": str(30000000 + i) if i % 3 == 0 else None,
+        "wos": f"WOS:{i:015d}" if i % 4 == 0 else None,
+        "eid": f"2-s2.0-{85000000000 + i}",
+        "authors": [f"Author {(i + k) % 500}" for k in range(1 + i % 5)],
+        "in_hal": i % 10 < 7,
+        "in_scopus": i % 20 < 17,
+        "in_orcid": i % 10 != 3,
+    }
+
+@lru_cache(maxsize=32)
+def synthetic_works(n: int) -> tuple:
+    """
+    Travaux d'un profil synthétique (mis en cache : chaque page ne régénère pas le profil).
+
+    Args:
+        n(int) : nombre de travaux
+
+    Return:
+        tuple : travaux
+    """
+    return tuple(synthetic_work(i) for i in range(n))
+
+def hal_doc(work: dict, forms: list) -> dict:
+    doc = {
+        "docid": str(1000000 + work["i"]),
+        "title_s": [work["title"]],
+        "journalTitle_s": work["journal"],
+        "journalPublisher_s": work["publisher"],
+        "publicationDate_s": f"{work['year']}-{1 + work['i'] % 12:02d}-01",
+        "publicationDateY_i": work["year"],
+        "authLastNameFirstName_s": work["authors"],
+        "authIdFormPerson_s": forms,
+    }
+    if work["doi"]:
+        doc["doiId_s"] = work["doi"]
+    if work["pmid"]:
+        doc["pubmedId_id"] = work["pmid"]
+    return doc
+
+def hal_response(path: str, query: dict) -> tuple[int, dict]:
+    """
+    Réponse de l'API HAL pour un profil synthétique (/ref/author et /search/, pagination start ou cursorMark).
+
+    Args:
+        path(str) : chemin après /hal
+        query(dict) : paramètres
+
+    Return:
+        tuple[int, dict] : (code HTTP, contenu)
+    """
+    q = query.get("q", "")
+    if path.startswith("/ref/author"):
+        idhal = q.split("idHal_s:", 1)[1] if "idHal_s:" in q else ""
+        n = synthetic_size(idhal)
+        docs = [] if n is None else [{"docid": f"{n}-1"}, {"docid": f"{n}-2"}]
+        return 200, {"response": {"numFound": len(docs), "docs": docs}}
+
+    forms = set(re.findall(r"\d+-\d", q))
+    docs = []
+    for n in {int(form.split("-")[0]) for form in forms}:
+        for work in synthetic_works(n):
+            # Deux formes auteur : un travail sur dix est signé sous les deux
+            work_forms = [f"{n}-1", f"{n}-2"] if work["i"] % 10 == 0 else [f"{n}-{1 + work['i'] % 2}"]
+            if work["in_hal"] and forms & set(work_forms):
+                docs.append(hal_doc(work, work_forms))
+
+    body = {}
+    if query.get("facet") == "true":
+        counts = {}
+        for doc in docs:
+            counts[doc["publicationDateY_i"]] = counts.get(doc["publicationDateY_i"], 0) + 1
+        body["facet_counts"] = {"facet_fields": {query.get("facet.field"): [x for year in sorted(counts) for x in (str(year), counts[year])]}}
+
+    rows = int(query.get("rows", 30))
+    if "cursorMark" in query:
+        start = 0 if query["cursorMark"] == "*" else int(query["cursorMark"])
+        page = docs[start:start + rows]
+        body["nextCursorMark"] = str(start + len(page)) if page else query["cursorMark"]
+    else:
+        start = int(query.get("start", 0))
+        page = docs[start:start + rows]
+    if query.get("fl"):
+        fields = query["fl"].split(",")
+        page = [{field: doc[field] for field in fields if field in doc} for doc in page]
+    body["response"] = {"numFound": len(docs), "start": start, "docs": page}
+    return 200, body
+
+def orcid_external_ids(work: dict) -> list:
+    ids = [("doi", work["doi"]), ("pmid", work["pmid"]), ("wosuid", work["wos"]), ("eid", work["eid"])]
+    return [{"external-id-type": id_type, "external-id-value": value, "external-id-relationship": "self"}
+            for id_type, value in ids if value]
+
+def orcid_response(api: str, path: str) -> tuple[int, dict]:
+    """
+    Réponse de l'API ORCID pour un profil synthétique (profil complet, ou travaux par lots works/{a,b,...}).
+
+    Args:
+        api(str) : "orcid" (profil) ou "orcid-api" (travaux)
+        path(str) : chemin après le préfixe de l'API
+
+    Return:
+        tuple[int, dict] : (code HTTP, contenu)
+    """
+    parts = path.strip("/").split("/")
+    n = synthetic_size(parts[0])
+    if n is None:
+        return 404, {"error-desc": {"value": "Not found"}}
+    works = [work for work in synthetic_works(n) if work["in_orcid"]]
+
+    if api == "orcid-api" and len(parts) == 3 and parts[1] == "works":
+        put_codes = parts[2].split(",")
+        if len(put_codes) > ORCID_BULK_SIZE:
+            return 400, {"developer-message": f"Too many put-codes (max {ORCID_BULK_SIZE})"}
+        bulk = []
+        for put_code in put_codes:
+            # Put-code i + 1 : version principale, 10 000 000 + i : seconde version (un travail sur cinq)
+            i = int(put_code) - 1 if int(put_code) < 10000000 else int(put_code) - 10000000
+            if 0 <= i < n and synthetic_work(i)["in_orcid"]:
+                work = synthetic_work(i)
+                bulk.append({"work": {
+                    "put-code": int(put_code),
+                    "external-ids": {"external-id": orcid_external_ids(work)},
+                    "contributors": {"contributor": [{"credit-name": {"value": author}} for author in work["authors"]]},
+                }})
+            else:
+                bulk.append({"error": {"response-code": 404, "developer-message": f"No work {put_code}"}})
+        return 200, {"bulk": bulk}
+
+    groups = []
+    for work in works:
+        summaries = [{
+            "put-code": put_code,
+            "path": f"/{parts[0]}/work/{put_code}",
+            "title": {"title": {"value": work["title"]}},
+            "journal-title": {"value": work["journal"]} if work["i"] % 7 else None,
+            "publication-date": {"year": {"value": str(work["year"])}},
+        } for put_code in ([work["i"] + 1, 10000000 + work["i"]] if work["i"] % 5 == 0 else [work["i"] + 1])]
+        groups.append({"external-ids": {"external-id": orcid_external_ids(work)}, "work-summary": summaries})
+    return 200, {"activities-summary": {"works": {"group": groups}}}
+
+def scopus_response(query: dict) -> tuple[int, dict]:
+    """
+    Réponse de l'API de recherche Scopus pour un profil synthétique (pagination start, limite de décalage, curseur).
+
+    Args:
+        query(dict) : paramètres
+
+    Return:
+        tuple[int, dict] : (code HTTP, contenu)
+    """
+    match = re.search(r"AU-ID\((\w+)\)", query.get("query", ""))
+    n = synthetic_size(match.group(1)) if match else None
+    works = [work for work in synthetic_works(n) if work["in_scopus"]] if n else []
+    count = int(query.get("count", 25))
+
+    if "cursor" in query:
+        start = 0 if query["cursor"] == "*" else int(query["cursor"])
+    else:
+        start = int(query.get("start", 0))
+        if start + count > SCOPUS_OFFSET_LIMIT and start < len(works):
+            return 400, {"service-error": {"status": {"statusCode": "INVALID_INPUT",
+                                                      "statusText": f"Start plus count exceeds {SCOPUS_OFFSET_LIMIT}"}}}
+
+    entries = []
+    for work in works[start:start + count]:
+        entry = {
+            "dc:identifier": f"SCOPUS_ID:{85000000000 + work['i']}",
+            "eid": work["eid"],
+            "dc:title": work["title"],
+            "prism:publicationName": work["journal"],
+            "prism:coverDate": f"{work['year']}-01-01",
+            "prism:coverDisplayDate": work["display_date"],
+            "link": [{"@ref": "self", "@href": f"https://api.elsevier.com/content/abstract/scopus_id/{85000000000 + work['i']}"}],
+        }
+        if work["doi"]:
+            entry["prism:doi"] = work["doi"]
+        if work["pmid"]:
+            entry["pubmed-id"] = work["pmid"]
+        entries.append(entry)
+    if query.get("field"):
+        fields = query["field"].split(",")
+        entries = [{field: entry[field] for field in fields if field in entry} for entry in entries]
+    if not works:
+        entries = [{"@_fa": "true", "error": "Result set was empty"}]
+
+    search_results = {"opensearch:totalResults": str(len(works)), "opensearch:startIndex": str(start), "entry": entries}
+    if "cursor" in query:
+        search_results["cursor"] = {"@current": query["cursor"], "@next": str(start + count)}
+    return 200, {"search-results": search_results}
+
+# ---- Injection de pannes ----
+
+class Faults:
+    """
+    Latence, erreurs, limite de débit (par seconde) et quota (par fenêtre) appliqués à chaque requête, par API.
+    """
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, rate_limit: float = None,
+                 quota: int = None, quota_window: float = 60.0, seed: int = 0):
+        """
+        Initialise la classe Faults.
+
+        Args:
+            latency(float) : latence moyenne en secondes (entre 0.5 et 1.5 fois cette valeur)
+            error_rate(float) : part des requêtes en erreur 503
+            rate_limit(float) : requêtes par seconde autorisées par API (au-delà : 429)
+            quota(int) : requêtes autorisées par API et par fenêtre (au-delà : 429 jusqu'à la fin de la fenêtre)
+            quota_window(float) : durée de la fenêtre du quota en secondes
+            seed(int) : graine du générateur aléatoire
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.quota = quota
+        self.quota_window = quota_window
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._windows = {}
+
+    def apply(self, api: str) -> tuple[int, dict]:
+        """
+        Attend la latence puis décide si la requête est refusée.
+
+        Args:
+            api(str) : nom de l'API
+
+        Return:
+            tuple[int, dict] : (code d'erreur ou None, en-têtes X-RateLimit-* à ajouter à la réponse)
+        """
+        with self._lock:
+            delay = self.latency * (0.5 + self._random.random())
+            failed = self._random.random() < self.error_rate
+        time.sleep(delay)
+
+        headers = {}
+        with self._lock:
+            now = time.time()
+            if self.quota is not None:
+                window_start, used = self._windows.get(api, (now, 0))
+                if now - window_start >= self.quota_window:
+                    window_start, used = now, 0
+                reset = window_start + self.quota_window
+                if used >= self.quota:
+                    headers.update({"X-RateLimit-Limit": str(self.quota), "X-RateLimit-Remaining": "0",
+                                    "X-RateLimit-Reset": str(math.ceil(reset)), "Retry-After": str(max(1, int(reset - now) + 1))})
+                    return 429, headers
+                used += 1
+                self._windows[api] = (window_start, used)
+                headers.update({"X-RateLimit-Limit": str(self.quota), "X-RateLimit-Remaining": str(self.quota - used),
+                                "X-RateLimit-Reset": str(math.ceil(reset))})
+            if self.rate_limit is not None:
+                tokens, last = self._buckets.get(api, (self.rate_limit, now))
+                tokens = min(self.rate_limit, tokens + (now - last) * self.rate_limit)
+                if tokens < 1:
+                    self._buckets[api] = (tokens, now)
+                    headers["Retry-After"] = "1"
+                    return 429, headers
+                self._buckets[api] = (tokens - 1, now)
+        return (503 if failed else None), headers
+
+# ---- Serveur ----
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    faults: Faults = Faults()
+    recordings: str = None
+    record: bool = False
+    stats: dict = {}
+    stats_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status: int, body, headers: dict = None):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def recording_path(self, upstream_url: str) -> str:
+        return os.path.join(self.recordings, f"{cache_key(upstream_url, headers={'Accept': self.headers.get('Accept')})}.json")
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        api = next((name for name in sorted(DEFAULT_BASE_URLS, key=len, reverse=True) if parts.path.startswith(f"/{name}/")), None)
+        if api is None:
+            return self.reply(404, {"error": f"unknown API for {parts.path}"})
+        path = parts.path[len(api) + 1:]
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        with self.stats_lock:
+            self.stats[api] = self.stats.get(api, 0) + 1
+
+        status, headers = self.faults.apply(api)
+        if status is not None:
+            return self.reply(status, {"error": f"injected {status}"}, headers)
+
+        # ---- 1. Réponses enregistrées (ou enregistrement depuis la vraie API) ----
+        upstream_url = DEFAULT_BASE_URLS[api] + path + (f"?{parts.query}" if parts.query else "")
+        if self.recordings:
+            recording = self.recording_path(upstream_url)
+            if os.path.exists(recording):
+                with open(recording, encoding="utf-8") as file:
+                    saved = json.load(file)
+                return self.reply(saved["status"], saved["body"].encode(), {**saved["headers"], **headers})
+            if self.record:
+                forwarded = {name: value for name, value in self.headers.items() if name.lower() in ["accept", "x-els-apikey"]}
+                response = requests.get(upstream_url, headers=forwarded, timeout=60)
+                saved_headers = {name: response.headers[name] for name in ["ETag", "Last-Modified"] if name in response.headers}
+                os.makedirs(self.recordings, exist_ok=True)
+                with open(recording, "w", encoding="utf-8") as file:
+                    json.dump({"status": response.status_code, "headers": saved_headers, "body": response.text}, file)
+                return self.reply(response.status_code, response.content, {**saved_headers, **headers})
+
+        # ---- 2. Profils synthétiques ----
+        if api == "hal":
+            status, body = hal_response(path, query)
+        elif api in ["orcid", "orcid-api"]:
+            status, body = orcid_response(api, path)
+        else:
+            status, body = scopus_response(query)
+        self.reply(status, body, headers)
+
+def start_server(port: int = 0, faults: Faults = None, recordings: str = None, record: bool = False) -> ThreadingHTTPServer:
+    """
+    Démarre le serveur dans un fil d'exécution (pour les mesures et les tests dans le même processus).
+
+    Args:
+        port(int) : port d'écoute (0 : port libre choisi par le système)
+        faults(Faults) : pannes injectées (par défaut aucune)
+        recordings(str) : dossier des réponses enregistrées (optionnel)
+        record(bool) : enregistrer les réponses manquantes depuis les vraies API
+
+    Return:
+        ThreadingHTTPServer : serveur démarré (server.server_port, server.shutdown())
+    """
+    handler = type("Handler", (ReplayHandler,), {"faults": faults or Faults(), "recordings": recordings, "record": record, "stats": {}})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765, help="port d'écoute (8765 par défaut)")
+    parser.add_argument("--latency", type=float, default=0.0, help="latence moyenne par requête en secondes")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="part des requêtes en erreur 503")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requêtes par seconde autorisées par API")
+    parser.add_argument("--quota", type=int, default=None, help="requêtes autorisées par API et par fenêtre (en-têtes X-RateLimit-*)")
+    parser.add_argument("--quota-window", type=float, default=60.0, help="durée de la fenêtre du quota en secondes")
+    parser.add_argument("--recordings", help="dossier des réponses enregistrées")
+    parser.add_argument("--record", action="store_true", help="enregistrer les réponses manquantes depuis les vraies API")
+    args = parser.parse_args()
+
+    faults = Faults(args.latency, args.error_rate, args.rate_limit, args.quota, args.quota_window)
+    server = start_server(args.port, faults, args.recordings, args.record)
+    print(f"Serveur de rejeu sur http://127.0.0.1:{server.server_port} (API_BASE_URL=http://127.0.0.1:{server.server_port})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
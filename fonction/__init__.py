@@ -1,22 +1,58 @@
-from ._misc import markdown_title, move_column_first
-from ._hal import get_hal_researcher_data, id_author, base_link
-from ._scopus import Scopus_Researcher
-from ._tx_recoupement import TxRecoupement, compare_publication_databases, compare_all_databases, suggest_column_mapping, create_id_column
-from ._wos import CheckResearcherInPaper, action_suggeree
-from ._orcid import Orcid_Researcher
+from importlib import import_module
 
-__all__ = ["get_hal_researcher_data",
-        "markdown_title",
-        "Scopus_Researcher",
-        "move_column_first",
-        "TxRecoupement",
-        "CheckResearcherInPaper",
-        "action_suggeree",
-        "Orcid_Researcher",
-        "compare_publication_databases",
-        "compare_all_databases",
-        "suggest_column_mapping",
-        "id_author",
-        "base_link",
-        "create_id_column",
-]
\ No newline at end of file
+# Module de chaque nom exporté. Les modules ne sont importés qu'à la première utilisation (PEP 562) :
+# la ligne de commande (python -m fonction) n'importe ainsi ni Streamlit ni Matplotlib.
+_EXPORTS = {
+    "markdown_title": "._misc",
+    "move_column_first": "._misc",
+    "get_hal_researcher_data": "._hal",
+    "id_author": "._hal",
+    "base_link": "._hal",
+    "hal_publication_years": "._hal",
+    "Scopus_Researcher": "._scopus",
+    "TxRecoupement": "._tx_recoupement",
+    "compare_publication_databases": "._tx_recoupement",
+    "compare_all_databases": "._tx_recoupement",
+    "suggest_column_mapping": "._tx_recoupement",
+    "IdIndex": "._comparison",
+    "PairComparison": "._comparison",
+    "ComparisonResult": "._comparison",
+    "TypedIdMatch": "._comparison",
+    "compare_databases": "._comparison",
+    "frame_fingerprint": "._comparison",
+    "CheckResearcherInPaper": "._wos",
+    "action_suggeree": "._wos",
+    "Orcid_Researcher": "._orcid",
+    "PublicationClusters": "._overlap",
+    "compute_overlap": "._overlap",
+    "create_id_column": "._identifiers",
+    "id_table": "._identifiers",
+    "TITLE_MATCH_THRESHOLD": "._titles",
+    "match_titles": "._titles",
+    "title_features": "._titles",
+    "LocalFetcher": "._batch",
+    "read_roster": "._batch",
+    "run_batch": "._batch",
+    "fetch_sources": "._batch",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    """
+    Importe à la demande le module qui définit un nom exporté.
+
+    Args:
+        name(str) : nom demandé
+
+    Return:
+        objet exporté
+    """
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,145 @@
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+from ._batch import LocalFetcher, fetch_researcher, read_data_file, read_roster, run_batch
+from ._comparison import ComparisonResult
+from ._titles import TITLE_MATCH_THRESHOLD
+
+# Nom de base déduit du nom de fichier (premier motif trouvé, en minuscules)
+DATABASE_PATTERNS = {"hal": "HAL", "scopus": "Scopus", "orcid": "Orcid", "wos": "WoS", "web of science": "WoS", "savedrecs": "WoS"}
+
+def database_name(file_path: str) -> tuple[str, str]:
+    """
+    Déduit le nom de la base d'un fichier : "NOM=chemin" explicite, sinon d'après le nom du fichier.
+
+    Args:
+        file_path(str) : argument de la ligne de commande
+
+    Return:
+        tuple[str, str] : (nom de la base, chemin du fichier)
+    """
+    if "=" in file_path and not os.path.exists(file_path):
+        name, file_path = file_path.split("=", 1)
+        return name, file_path
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    name = next((name for pattern, name in DATABASE_PATTERNS.items() if pattern in stem.lower()), stem)
+    return name, file_path
+
+def write_table(df: pd.DataFrame, file_path: str):
+    """
+    Écrit un tableau en CSV ou en Parquet selon l'extension.
+
+    Args:
+        df(pd.DataFrame) : tableau à écrire
+        file_path(str) : chemin du fichier (.csv ou .parquet)
+    """
+    if file_path.endswith(".parquet"):
+        # Les colonnes objet mélangent souvent chaînes et nombres (identifiants) : Parquet exige un type unique
+        objects = df.select_dtypes(include="object").columns
+        df.astype({col: "string" for col in objects}).to_parquet(file_path, index=False)
+    else:
+        df.to_csv(file_path, index=False)
+
+def compare(args: argparse.Namespace):
+    """
+    Compare des bases de données (fichiers ou récupérées par identifiant) et écrit les résultats.
+
+    Args:
+        args(argparse.Namespace) : arguments de la ligne de commande
+    """
+    databases, errors = {}, {}
+    for file_path in args.files:
+        name, file_path = database_name(file_path)
+        if name in databases:
+            raise SystemExit(f"Deux fichiers pour la base {name} : préciser NOM=chemin")
+        databases[name] = read_data_file(file_path)
+
+    researcher = {"nom": args.nom, "prenom": args.prenom, "orcid": args.orcid, "idhal": args.idhal, "scopus_id": args.scopus_id}
+    if any(researcher[key] for key in ["orcid", "idhal", "scopus_id"]) or (args.nom and args.prenom):
+        fetched, errors = fetch_researcher(researcher)
+        databases.update({name: df for name, df in fetched.items() if name not in databases})
+    for name, message in errors.items():
+        print(f"{name} : {message}", file=sys.stderr)
+
+    if len(databases) < 2:
+        raise SystemExit("Au moins deux bases de données sont nécessaires pour effectuer une comparaison.")
+
+    start = time.perf_counter()
+    result = ComparisonResult(databases, args.title_threshold)
+    elapsed = time.perf_counter() - start
+    n_records = sum(len(df) for df in databases.values())
+    print(f"Comparaison de {n_records} enregistrements en {elapsed:.2f} s", file=sys.stderr)
+
+    os.makedirs(args.output, exist_ok=True)
+    extension = f".{args.format}"
+    write_table(result.recap, os.path.join(args.output, f"recapitulatif{extension}"))
+    write_table(result.intersections, os.path.join(args.output, f"intersections{extension}"))
+    for key, pair in result.pairs.items():
+        write_table(pair.source, os.path.join(args.output, f"{key}{extension}"))
+    print(result.recap.to_string(index=False))
+    print(f"Résultats écrits dans {args.output}", file=sys.stderr)
+
+def batch(args: argparse.Namespace):
+    """
+    Audite tous les chercheurs d'un roster et écrit le tableau de couverture.
+
+    Args:
+        args(argparse.Namespace) : arguments de la ligne de commande
+    """
+    roster = read_roster(args.roster)
+    fetcher = LocalFetcher(args.local) if args.local else fetch_researcher
+
+    def progress(done: int, total: int):
+        print(f"\r{done}/{total} chercheurs audités", end="", file=sys.stderr, flush=True)
+
+    coverage = run_batch(roster, fetcher=fetcher, workers=args.workers, title_threshold=args.title_threshold, progress=progress)
+    print(file=sys.stderr)
+
+    if args.output.endswith(".xlsx"):
+        coverage.to_excel(args.output, index=False)
+    else:
+        coverage.to_csv(args.output, index=False)
+    print(f"Tableau de couverture écrit dans {args.output}", file=sys.stderr)
+
+def main(argv: list = None):
+    """
+    Point d'entrée de la ligne de commande : python -m fonction <commande> ...
+
+    Args:
+        argv(list) : arguments (par défaut, ceux de la ligne de commande)
+    """
+    parser = argparse.ArgumentParser(prog="python -m fonction", description="Research Visibility Checker sans interface")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compare_parser = commands.add_parser("compare", help="comparaison des publications de plusieurs bases")
+    compare_parser.add_argument("files", nargs="*", help="exports (.csv, .xlsx, .parquet), base déduite du nom ou NOM=chemin")
+    compare_parser.add_argument("--nom", help="nom du chercheur (recherche HAL sans idHAL)")
+    compare_parser.add_argument("--prenom", help="prénom du chercheur (recherche HAL sans idHAL)")
+    compare_parser.add_argument("--orcid", help="identifiant ou URL ORCID à récupérer")
+    compare_parser.add_argument("--idhal", help="idHAL à récupérer")
+    compare_parser.add_argument("--scopus-id", help="identifiant auteur Scopus à récupérer")
+    compare_parser.add_argument("-o", "--output", default="resultats", help="dossier de sortie")
+    compare_parser.add_argument("-f", "--format", choices=["csv", "parquet"], default="csv", help="format des fichiers écrits")
+    compare_parser.add_argument("--title-threshold", type=float, default=TITLE_MATCH_THRESHOLD,
+                                help="similarité minimale des titres pour rapprocher des publications sans identifiant commun")
+    compare_parser.set_defaults(handler=compare)
+
+    batch_parser = commands.add_parser("batch", help="audit de visibilité d'une liste de chercheurs")
+    batch_parser.add_argument("roster", help="CSV des chercheurs (colonnes nom, prenom, orcid, idhal, scopus_id, wos)")
+    batch_parser.add_argument("-o", "--output", default="couverture.csv", help="fichier de sortie (.csv ou .xlsx)")
+    batch_parser.add_argument("-w", "--workers", type=int, default=None, help="nombre de processus (par défaut, le nombre de cœurs)")
+    batch_parser.add_argument("--title-threshold", type=float, default=TITLE_MATCH_THRESHOLD,
+                              help="similarité minimale des titres pour rapprocher des publications sans identifiant commun")
+    batch_parser.add_argument("--local", metavar="DOSSIER",
+                              help="lire les exports <base>_<identifiant>.<csv|xlsx|parquet> d'un dossier au lieu d'appeler les API")
+    batch_parser.set_defaults(handler=batch)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+
+import pandas as pd
+
+from ._comparison import ComparisonResult
+from ._hal import get_hal_researcher_data
+from ._orcid import Orcid_Researcher
+from ._scopus import Scopus_Researcher
+from ._titles import TITLE_MATCH_THRESHOLD
+
+# Colonnes reconnues dans le fichier de chercheurs (roster) et leurs variantes acceptées
+ROSTER_COLUMNS = {
+    "nom": ["nom", "last_name", "lastname"],
+    "prenom": ["prenom", "prénom", "first_name", "firstname"],
+    "orcid": ["orcid", "orcid_url", "orcid_link"],
+    "idhal": ["idhal", "id_hal"],
+    "scopus_id": ["scopus_id", "scopus", "au_id"],
+    "wos": ["wos", "wos_file", "fichier_wos"],
+}
+
+# Ordre des bases dans le tableau de couverture
+SOURCES = ["HAL", "Scopus", "Orcid", "WoS"]
+
+def read_data_file(file_path: str) -> pd.DataFrame:
+    """
+    Lit un export de publications (CSV, Excel ou Parquet).
+
+    Args:
+        file_path(str) : chemin du fichier
+
+    Return:
+        pd.DataFrame : publications du fichier
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        return pd.read_csv(file_path)
+    if extension == ".parquet":
+        return pd.read_parquet(file_path)
+    return pd.read_excel(file_path)
+
+def read_roster(file_path: str) -> pd.DataFrame:
+    """
+    Lit le fichier CSV des chercheurs à auditer (une ligne par chercheur).
+
+    Colonnes reconnues (casse et variantes indifférentes) : nom, prenom, orcid, idhal, scopus_id et wos
+    (chemin d'un export Web of Science). Chaque chercheur doit avoir au moins un identifiant, ou son nom et son prénom.
+
+    Args:
+        file_path(str) : chemin du fichier CSV
+
+    Return:
+        pd.DataFrame : chercheurs avec les colonnes normalisées (valeurs manquantes à None)
+    """
+    roster = pd.read_csv(file_path, dtype=str, sep=None, engine="python")
+    columns = {col.strip().lower(): col for col in roster.columns}
+
+    normalized = pd.DataFrame(index=roster.index)
+    for name, aliases in ROSTER_COLUMNS.items():
+        source_col = next((columns[alias] for alias in aliases if alias in columns), None)
+        normalized[name] = roster[source_col].str.strip() if source_col is not None else None
+    normalized = normalized.replace("", None).astype(object).where(normalized.notna(), None)
+
+    # La recherche HAL par nom demande le nom et le prénom : un nom seul ne donnerait aucune publication
+    full_name = normalized["nom"].notna() & normalized["prenom"].notna()
+    missing = normalized[["orcid", "idhal", "scopus_id", "wos"]].isna().all(axis=1) & ~full_name
+    if missing.any():
+        raise ValueError(f"Chercheurs sans identifiant ni nom et prénom dans {file_path} (lignes {', '.join(str(i + 2) for i in missing[missing].index)})")
+    return normalized.reset_index(drop=True)
+
+def researcher_label(researcher: dict) -> str:
+    """
+    Nom affiché d'un chercheur : prénom et nom, sinon son premier identifiant.
+
+    Args:
+        researcher(dict) : ligne du roster
+
+    Return:
+        str : nom du chercheur
+    """
+    name = " ".join(part for part in [researcher.get("prenom"), researcher.get("nom")] if part)
+    return name or next((researcher[key] for key in ["idhal", "orcid", "scopus_id"] if researcher.get(key)), "")
+
+def fetch_sources(fetchers: dict, progress=None) -> tuple[dict, dict]:
+    """
+    Lance les récupérations de plusieurs bases en parallèle (un fil d'exécution par base) :
+    l'attente totale est celle de la base la plus lente.
+
+    Args:
+        fetchers(dict) : {nom de la base: fonction sans argument qui renvoie un DataFrame, un message d'erreur ou None}
+        progress : fonction appelée avec (nom de la base, DataFrame ou None, erreur ou None, durée en secondes)
+            à la fin de chaque récupération, depuis le fil appelant (optionnel)
+
+    Return:
+        tuple[dict, dict] : ({nom de la base: pd.DataFrame}, {nom de la base: message d'erreur})
+    """
+    databases, errors = {}, {}
+    if not fetchers:
+        return databases, errors
+
+    def timed(fetch) -> tuple:
+        start = time.perf_counter()
+        return fetch(), time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+        futures = {executor.submit(timed, fetch): source for source, fetch in fetchers.items()}
+        for future in as_completed(futures):
+            source = futures[future]
+            elapsed = None
+            try:
+                df, elapsed = future.result()
+            except Exception as e:
+                errors[source] = str(e)
+            else:
+                if isinstance(df, pd.DataFrame):
+                    databases[source] = df
+                else:
+                    # Les fonctions de récupération renvoient un message ou None en cas d'échec
+                    errors[source] = df if isinstance(df, str) else "aucune donnée récupérée"
+            if progress is not None:
+                progress(source, databases.get(source), errors.get(source), elapsed)
+
+    # Ordre des bases indépendant de l'ordre d'arrivée
+    return {source: databases[source] for source in fetchers if source in databases}, errors
+
+def fetch_researcher(researcher: dict) -> tuple[dict, dict]:
+    """
+    Récupère les publications d'un chercheur depuis ORCID, HAL et Scopus (et l'export WoS s'il est fourni).
+
+    Args:
+        researcher(dict) : ligne du roster
+
+    Return:
+        tuple[dict, dict] : ({nom de la base: pd.DataFrame}, {nom de la base: message d'erreur})
+    """
+    fetchers = {}
+    if researcher.get("idhal") or (researcher.get("nom") and researcher.get("prenom")):
+        fetchers["HAL"] = lambda: get_hal_researcher_data(researcher.get("nom"), researcher.get("prenom"), researcher.get("idhal"))
+    if researcher.get("orcid"):
+        orcid = researcher["orcid"]
+        orcid_link = orcid if orcid.startswith("https://orcid.org/") else f"https://orcid.org/{orcid}"
+        fetchers["Orcid"] = lambda: Orcid_Researcher(orcid_link=orcid_link).format_df_orcids()
+    if researcher.get("scopus_id"):
+        fetchers["Scopus"] = lambda: Scopus_Researcher(scopus_id=researcher["scopus_id"]).get_publication_scopus()
+    if researcher.get("wos"):
+        fetchers["WoS"] = lambda: read_data_file(researcher["wos"])
+
+    return fetch_sources(fetchers)
+
+class LocalFetcher:
+    """
+    Remplace les API par des exports locaux, pour rejouer un audit hors ligne.
+
+    Les fichiers sont cherchés dans un dossier sous la forme "<base>_<identifiant>.<csv|xlsx|parquet>" :
+    hal_<idhal>, orcid_<orcid>, scopus_<scopus_id> et wos_<idhal ou orcid>. Un chercheur connu de HAL par son
+    seul nom n'a pas d'export HAL : l'erreur est reportée dans le tableau de couverture.
+    """
+    def __init__(self, directory: str):
+        """
+        Initialise la classe LocalFetcher.
+
+        Args:
+            directory(str) : dossier contenant les exports
+        """
+        self.directory = directory
+
+    def _find(self, source: str, identifier: str) -> str:
+        """
+        Recherche l'export d'une base pour un identifiant.
+
+        Args:
+            source(str) : nom de la base en minuscules
+            identifier(str) : identifiant du chercheur dans cette base
+
+        Return:
+            str : chemin du fichier, ou None s'il n'existe pas
+        """
+        identifier = identifier.rstrip("/").split("/")[-1]
+        for extension in [".csv", ".xlsx", ".parquet"]:
+            file_path = os.path.join(self.directory, f"{source}_{identifier}{extension}")
+            if os.path.exists(file_path):
+                return file_path
+        return None
+
+    def __call__(self, researcher: dict) -> tuple[dict, dict]:
+        """
+        Charge les exports locaux d'un chercheur.
+
+        Args:
+            researcher(dict) : ligne du roster
+
+        Return:
+            tuple[dict, dict] : ({nom de la base: pd.DataFrame}, {nom de la base: message d'erreur})
+        """
+        identifiers = {
+            "HAL": researcher.get("idhal"),
+            "Orcid": researcher.get("orcid"),
+            "Scopus": researcher.get("scopus_id"),
+            "WoS": researcher.get("idhal") or researcher.get("orcid"),
+        }
+        databases, errors = {}, {}
+        for source, identifier in identifiers.items():
+            if not identifier:
+                continue
+            file_path = self._find(source.lower(), identifier)
+            if file_path is not None:
+                databases[source] = read_data_file(file_path)
+            elif source != "WoS":
+                errors[source] = f"aucun export {source.lower()}_{identifier} dans {self.directory}"
+        if researcher.get("wos") and "WoS" not in databases:
+            databases["WoS"] = read_data_file(researcher["wos"])
+        if not researcher.get("idhal") and researcher.get("nom"):
+            # La recherche HAL par nom passe par l'API : hors ligne, seul l'idHAL désigne un export
+            errors["HAL"] = "recherche par nom impossible hors ligne : renseigner l'idhal"
+        return databases, errors
+
+def audit_researcher(researcher: dict, fetcher=fetch_researcher, title_threshold: float = TITLE_MATCH_THRESHOLD) -> dict:
+    """
+    Récupère les publications d'un chercheur et calcule la couverture de chaque base.
+
+    Args:
+        researcher(dict) : ligne du roster
+        fetcher : fonction qui renvoie ({nom de la base: pd.DataFrame}, {nom de la base: erreur}) pour un chercheur
+        title_threshold(float) : similarité minimale des titres pour rapprocher des publications sans identifiant commun
+
+    Return:
+        dict : ligne du tableau de couverture
+    """
+    row = {"Chercheur": researcher_label(researcher)}
+    try:
+        databases, errors = fetcher(researcher)
+        databases = {name: df for name, df in databases.items() if not df.empty}
+        result = ComparisonResult(databases, title_threshold)
+    except Exception as e:
+        row["Erreurs"] = str(e)
+        return row
+
+    publications = result.publications
+    n_unique = len(publications)
+    row["Publications uniques"] = n_unique
+    for source in databases:
+        found = int(publications[source].sum())
+        row[f"Publications {source}"] = found
+        row[f"Couverture {source} (%)"] = round(found / n_unique * 100, 2) if n_unique else 0.0
+    row["Erreurs"] = "; ".join(f"{source} : {message}" for source, message in errors.items()) or None
+    return row
+
+def run_batch(roster: pd.DataFrame, fetcher=fetch_researcher, workers: int = None,
+              title_threshold: float = TITLE_MATCH_THRESHOLD, progress=None) -> pd.DataFrame:
+    """
+    Audite tous les chercheurs du roster en parallèle (un processus par chercheur à la fois).
+
+    Args:
+        roster(pd.DataFrame) : chercheurs (voir read_roster)
+        fetcher : fonction de récupération (fetch_researcher pour les API, LocalFetcher pour des exports locaux)
+        workers(int) : nombre de processus (par défaut, le nombre de cœurs)
+        title_threshold(float) : similarité minimale des titres pour rapprocher des publications sans identifiant commun
+        progress : fonction appelée avec (nombre de chercheurs traités, nombre total) après chaque chercheur (optionnel)
+
+    Return:
+        pd.DataFrame : tableau de couverture, une ligne par chercheur dans l'ordre du roster
+    """
+    researchers = roster.to_dict("records")
+    rows = [None] * len(researchers)
+    audit = partial(audit_researcher, fetcher=fetcher, title_threshold=title_threshold)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(audit, researcher): position for position, researcher in enumerate(researchers)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            position = futures[future]
+            try:
+                rows[position] = future.result()
+            except Exception as e:
+                rows[position] = {"Chercheur": researcher_label(researchers[position]), "Erreurs": str(e)}
+            if progress is not None:
+                progress(done, len(researchers))
+
+    coverage = pd.DataFrame(rows)
+    # Colonnes dans un ordre stable : chercheur, total, puis chaque base, puis les erreurs
+    columns = ["Chercheur", "Publications uniques"]
+    for source in [*SOURCES, *sorted({col[len("Publications "):] for col in coverage.columns if col.startswith("Publications ")} - {*SOURCES, "uniques"})]:
+        columns += [col for col in [f"Publications {source}", f"Couverture {source} (%)"] if col in coverage.columns]
+    columns.append("Erreurs")
+    coverage = coverage.reindex(columns=columns)
+    counts = [col for col in columns if col.startswith("Publications ")]
+    coverage[counts] = coverage[counts].astype("Int64")
+    return coverage
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Fichier du cache des réponses HTTP (chaîne vide pour le désactiver)
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(".cache", "http_cache.sqlite"))
+# Taille maximale du cache : au-delà, les réponses les moins récemment utilisées sont supprimées
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", 500 * 1024 * 1024))
+
+# Durée de validité des réponses par hôte, en secondes (0 : pas de cache). Au-delà, la réponse est
+# revalidée (ETag / Last-Modified) quand l'API le permet, sinon redemandée.
+SOURCE_TTLS = {
+    "api.archives-ouvertes.fr": 24 * 3600,
+    "orcid.org": 12 * 3600,
+    "pub.orcid.org": 12 * 3600,
+    # Le quota Scopus est limité : les réponses sont gardées plus longtemps
+    "api.elsevier.com": 7 * 24 * 3600,
+}
+DEFAULT_TTL = 0
+
+# Paramètres et en-têtes exclus de la clé (secrets) ; seul l'en-tête Accept change la réponse
+SECRET_PARAMS = {"insttoken", "apikey", "apiKey", "access_token"}
+KEY_HEADERS = ["Accept"]
+
+def public_url(url: str, params: dict = None) -> str:
+    """
+    URL normalisée d'une requête (hôte en minuscules, paramètres triés), sans paramètre secret.
+
+    Args:
+        url(str) : adresse
+        params(dict) : paramètres de la requête
+
+    Return:
+        str : adresse sans SECRET_PARAMS
+    """
+    parts = urlsplit(requests.Request("GET", url, params=params).prepare().url)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+def cache_key(url: str, params: dict = None, headers: dict = None) -> str:
+    """
+    Clé d'une requête : URL normalisée sans secret (public_url) et en-tête Accept.
+
+    Args:
+        url(str) : adresse
+        params(dict) : paramètres de la requête
+        headers(dict) : en-têtes
+
+    Return:
+        str : empreinte sha256 de la requête normalisée
+    """
+    key_headers = {name: (headers or {}).get(name) for name in KEY_HEADERS}
+    return hashlib.sha256(json.dumps([public_url(url, params), key_headers]).encode()).hexdigest()
+
+def source_ttl(url: str) -> int:
+    """
+    Durée de validité des réponses d'un hôte.
+
+    Args:
+        url(str) : adresse
+
+    Return:
+        int : durée en secondes (0 : pas de cache)
+    """
+    return SOURCE_TTLS.get(urlsplit(url).hostname, DEFAULT_TTL)
+
+class CachedResponse:
+    """
+    Réponse conservée dans le cache.
+    """
+    def __init__(self, url: str, status: int, headers: str, body: bytes, stored_at: float):
+        """
+        Initialise la classe CachedResponse.
+
+        Args:
+            url(str) : adresse de la requête
+            status(int) : code HTTP
+            headers(str) : en-têtes au format JSON
+            body(bytes) : contenu
+            stored_at(float) : date d'enregistrement ou de dernière revalidation (secondes)
+        """
+        self.url = url
+        self.status = status
+        self.headers: dict = json.loads(headers)
+        self.body = body
+        self.stored_at = stored_at
+
+    def is_fresh(self, ttl: int) -> bool:
+        """
+        Indique si la réponse est encore valide.
+
+        Args:
+            ttl(int) : durée de validité en secondes
+
+        Return:
+            bool : True si la réponse peut être utilisée sans interroger l'API
+        """
+        return time.time() - self.stored_at < ttl
+
+    def validators(self) -> dict:
+        """
+        En-têtes de revalidation conditionnelle (If-None-Match / If-Modified-Since) disponibles.
+
+        Return:
+            dict : en-têtes à ajouter à la requête
+        """
+        headers = CaseInsensitiveDict(self.headers)
+        validators = {}
+        if headers.get("ETag"):
+            validators["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        return validators
+
+    def to_response(self) -> requests.Response:
+        """
+        Reconstruit un objet requests.Response.
+
+        Return:
+            requests.Response : réponse (attribut from_cache à True)
+        """
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.url = self.url
+        response.reason = "OK"
+        response.from_cache = True
+        return response
+
+class ResponseCache:
+    """
+    Cache persistant des réponses HTTP (SQLite), partagé entre les sessions, les processus et les utilisateurs.
+
+    Seules les réponses 200 sont conservées. La taille totale est bornée (éviction LRU).
+
+    Le cache n'est qu'une optimisation : une erreur SQLite (base verrouillée trop longtemps, disque plein,
+    fichier corrompu...) est journalisée et la requête passe par le réseau.
+    """
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        """
+        Initialise la classe ResponseCache.
+
+        Args:
+            path(str) : fichier SQLite
+            max_bytes(int) : taille maximale des réponses conservées
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._shared_connection, self._connection_pid = None, None
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock, self._connection() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT,
+                    status INTEGER,
+                    headers TEXT,
+                    body BLOB,
+                    size INTEGER,
+                    stored_at REAL,
+                    accessed_at REAL
+                )""")
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            if connection.execute("PRAGMA user_version").fetchone()[0] < 1:
+                # Les adresses enregistrées avant le retrait des secrets sont nettoyées une seule fois
+                secret_urls = " OR ".join("url LIKE ?" for _ in SECRET_PARAMS)
+                rows = connection.execute(f"SELECT key, url FROM responses WHERE {secret_urls}",
+                                          [f"%{name}=%" for name in SECRET_PARAMS]).fetchall()
+                connection.executemany("UPDATE responses SET url = ? WHERE key = ?", [(public_url(url), key) for key, url in rows])
+                connection.execute("PRAGMA user_version = 1")
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Connexion SQLite unique du processus, partagée par les fils d'exécution sous self._lock
+        (à appeler avec le verrou). Un processus enfant (fork) ouvre sa propre connexion.
+
+        Return:
+            sqlite3.Connection : connexion
+        """
+        if self._connection_pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._shared_connection, self._connection_pid = connection, os.getpid()
+        return self._shared_connection
+
+    def get(self, key: str) -> CachedResponse:
+        """
+        Recherche une réponse dans le cache (et la marque comme récemment utilisée).
+
+        Args:
+            key(str) : clé de la requête (cache_key)
+
+        Return:
+            CachedResponse : réponse, ou None si elle est absente (ou si le cache est inutilisable)
+        """
+        try:
+            with self._lock, self._connection() as connection:
+                row = connection.execute("SELECT url, status, headers, body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            logger.warning("Cache HTTP illisible (%s) : requête envoyée sans cache", e)
+            return None
+        return CachedResponse(*row)
+
+    def store(self, key: str, response: requests.Response):
+        """
+        Enregistre une réponse puis supprime les moins récemment utilisées si la taille maximale est dépassée.
+
+        Args:
+            key(str) : clé de la requête (cache_key)
+            response(requests.Response) : réponse 200 à conserver
+        """
+        body = response.content
+        now = time.time()
+        try:
+            with self._lock, self._connection() as connection:
+                # Le fichier est partagé : l'adresse est enregistrée sans les secrets (insttoken...)
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, public_url(response.url), response.status_code, json.dumps(dict(response.headers)), body, len(body), now, now),
+                )
+                total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                if total > self.max_bytes:
+                    # Suppression par ordre d'utilisation jusqu'à revenir sous la taille maximale
+                    excess = total - self.max_bytes
+                    connection.execute("""
+                        DELETE FROM responses WHERE key IN (
+                            SELECT key FROM (
+                                SELECT key, SUM(size) OVER (ORDER BY accessed_at, key) - size AS freed_before
+                                FROM responses
+                            ) WHERE freed_before < ?
+                        )""", (excess,))
+        except sqlite3.Error as e:
+            logger.warning("Réponse non enregistrée dans le cache HTTP (%s)", e)
+
+    def refresh(self, key: str):
+        """
+        Prolonge la validité d'une réponse confirmée par l'API (304 Not Modified).
+
+        Args:
+            key(str) : clé de la requête (cache_key)
+        """
+        now = time.time()
+        try:
+            with self._lock, self._connection() as connection:
+                connection.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+        except sqlite3.Error as e:
+            logger.warning("Validité de la réponse non prolongée dans le cache HTTP (%s)", e)
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def response_cache() -> ResponseCache:
+    """
+    Cache des réponses HTTP partagé par toutes les récupérations (None s'il est désactivé ou inutilisable).
+
+    Return:
+        ResponseCache : cache
+    """
+    if not HTTP_CACHE_PATH:
+        return None
+    with _caches_lock:
+        if HTTP_CACHE_PATH not in _caches:
+            try:
+                _caches[HTTP_CACHE_PATH] = ResponseCache(HTTP_CACHE_PATH)
+            except (sqlite3.Error, OSError):
+                # Dossier en lecture seule, base corrompue... : les requêtes se font sans cache
+                _caches[HTTP_CACHE_PATH] = None
+        return _caches[HTTP_CACHE_PATH]
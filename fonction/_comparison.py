@@ -0,0 +1,408 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+
+from ._identifiers import ID_COLUMNS, arrow_strings, create_id_column, id_table
+from ._overlap import PublicationClusters, compute_overlap, pair_title_matches
+from ._titles import TITLE_MATCH_THRESHOLD, title_features
+
+# Nombre de résultats de comparaison gardés en mémoire (les plus récemment utilisés)
+COMPARISON_CACHE_SIZE = 4
+# Nombre d'index de bases et de rapprochements par titre gardés en mémoire, par empreinte de base
+INDEX_CACHE_SIZE = 16
+TITLE_MATCH_CACHE_SIZE = 64
+
+# Colonne de correspondance de chaque type d'identifiant (TypedIdMatch)
+TYPED_MATCH_COLUMNS = {
+    "doi_norm": "common_doi",
+    "pmid": "common_pubmed",
+    "wos_ut": "common_wos",
+    "scopus_eid": "common_scopus",
+}
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Empreinte du contenu d'un DataFrame (colonnes, types et valeurs, dans l'ordre des lignes).
+
+    Args:
+        df(pd.DataFrame) : DataFrame à résumer
+
+    Return:
+        str : empreinte hexadécimale (sha256)
+    """
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    try:
+        hashes = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        # Cellules non hachables (listes d'auteurs HAL...) : elles sont résumées par leur représentation
+        hashes = pd.util.hash_pandas_object(
+            df.apply(lambda col: col.map(lambda value: repr(value) if isinstance(value, (list, dict, set)) else value)
+                     if col.dtype == object else col),
+            index=False,
+        )
+    digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+def comparison_key(fingerprints: dict, title_threshold: float) -> str:
+    """
+    Clé d'une comparaison : empreintes des bases (avec leur nom) et seuil de similarité des titres.
+
+    Args:
+        fingerprints(dict) : dictionnaire {nom de la base: empreinte}
+        title_threshold(float) : similarité minimale des titres
+
+    Return:
+        str : clé hexadécimale (sha256)
+    """
+    return hashlib.sha256(repr((list(fingerprints.items()), title_threshold)).encode()).hexdigest()
+
+def match_ids(source_long: pd.DataFrame, target_long: pd.DataFrame, n_rows: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Recherche par jointure de hachage les lignes de la source dont un identifiant existe dans la cible.
+
+    Args:
+        source_long(pd.DataFrame) : table longue (ligne, identifiant) de la source
+        target_long(pd.DataFrame) : table longue (ligne, identifiant) de la cible
+        n_rows(int) : nombre de lignes de la source
+
+    Return:
+        tuple[np.ndarray, np.ndarray] : masque des lignes trouvées et premier identifiant commun de chaque ligne.
+    """
+    hits = source_long[source_long["id"].isin(target_long["id"])]
+    # Premier identifiant commun dans l'ordre de la table longue (DOI, PubMed, WoS puis Scopus)
+    first_hits = hits.drop_duplicates("row")
+
+    found = np.zeros(n_rows, dtype=bool)
+    found[first_hits["row"].to_numpy()] = True
+
+    matching = np.full(n_rows, None, dtype=object)
+    matching[first_hits["row"].to_numpy()] = first_hits["id"].to_numpy()
+    return found, matching
+
+class IdIndex:
+    """
+    Index des identifiants d'une base de données de publications.
+
+    La normalisation des identifiants (colonnes canoniques typées), la table longue (ligne, identifiant)
+    et les titres normalisés ne sont calculés qu'une seule fois par base, puis partagés par toutes
+    les comparaisons dans lesquelles cette base intervient.
+    """
+    def __init__(self, df: pd.DataFrame, fingerprint: str = None):
+        """
+        Initialise la classe IdIndex.
+
+        Args:
+            df(pd.DataFrame) : base de données à indexer (elle n'est pas modifiée)
+            fingerprint(str) : empreinte de df si elle est déjà calculée (optionnel)
+        """
+        self.fingerprint: str = fingerprint if fingerprint is not None else frame_fingerprint(df)
+        self.df: pd.DataFrame = create_id_column(df.copy())
+        self.long: pd.DataFrame = id_table(self.df)
+        self.titles: pd.DataFrame = title_features(self.df)
+        has_ids = np.zeros(len(self.df), dtype=bool)
+        has_ids[self.long["row"].to_numpy()] = True
+        self.titles["has_ids"] = has_ids
+
+def typed_id_sets(df: pd.DataFrame) -> dict:
+    """
+    Valeurs distinctes de chaque colonne d'identifiant canonique, dans leur type natif.
+
+    Args:
+        df(pd.DataFrame) : DataFrame passé par create_id_column
+
+    Return:
+        dict : dictionnaire {colonne canonique: valeurs distinctes} (pyarrow pour les chaînes, int64 pour les PMID)
+    """
+    id_sets = {}
+    for id_col in ID_COLUMNS:
+        if id_col not in df.columns:
+            continue
+        values = df[id_col].dropna()
+        id_sets[id_col] = values.unique().astype("int64") if id_col == "pmid" else pc.unique(arrow_strings(values))
+    return id_sets
+
+def match_typed_ids(df: pd.DataFrame, id_sets: dict) -> pd.DataFrame:
+    """
+    Recherche chaque type d'identifiant de df dans les identifiants de même type de l'autre base.
+
+    Chaque type a sa propre table de hachage : DOI contre DOI, PMID (entier) contre PMID, UT WoS contre UT WoS.
+
+    Args:
+        df(pd.DataFrame) : DataFrame passé par create_id_column
+        id_sets(dict) : identifiants de l'autre base (typed_id_sets)
+
+    Return:
+        pd.DataFrame : une colonne booléenne par type (common_doi, common_pubmed, common_wos, common_scopus) et common_publi
+    """
+    common = pd.DataFrame(index=df.index)
+    for id_col, common_col in TYPED_MATCH_COLUMNS.items():
+        if id_col not in df.columns or id_col not in id_sets:
+            common[common_col] = False
+        elif id_col == "pmid":
+            common[common_col] = df[id_col].isin(id_sets[id_col]).fillna(False).to_numpy(dtype=bool)
+        else:
+            found = pc.is_in(arrow_strings(df[id_col]), value_set=id_sets[id_col])
+            common[common_col] = found.to_numpy(zero_copy_only=False)
+    common["common_publi"] = common[list(TYPED_MATCH_COLUMNS.values())].any(axis=1)
+    return common
+
+class TypedIdMatch:
+    """
+    Recoupement, type d'identifiant par type d'identifiant, entre une base et une autre (ex: ORCID), sans affichage.
+    """
+    def __init__(self, source_df: pd.DataFrame, target_df: pd.DataFrame):
+        """
+        Initialise la classe TypedIdMatch.
+
+        Args:
+            source_df(pd.DataFrame) : base source (elle n'est pas modifiée)
+            target_df(pd.DataFrame) : base cible, par exemple les publications ORCID (elle n'est pas modifiée)
+        """
+        source = create_id_column(source_df.copy())
+        target = create_id_column(target_df.copy())
+
+        self.source: pd.DataFrame = pd.concat([source, match_typed_ids(source, typed_id_sets(target))], axis=1)
+        self.target: pd.DataFrame = pd.concat([target, match_typed_ids(target, typed_id_sets(source))], axis=1)
+
+        self.common: pd.DataFrame = self.source[self.source["common_publi"]].reset_index(drop=True)
+        self.only_source: pd.DataFrame = self.source[~self.source["common_publi"]].reset_index(drop=True)
+        self.target_common: pd.DataFrame = self.target[self.target["common_publi"]].reset_index(drop=True)
+        self.target_only: pd.DataFrame = self.target[~self.target["common_publi"]].reset_index(drop=True)
+
+    @property
+    def overlap_rate(self) -> float:
+        """
+        Taux de recoupement : lignes de la source présentes dans la cible (en %).
+        """
+        return (len(self.common) / len(self.source)) * 100 if len(self.source) > 0 else 0.0
+
+class PairComparison:
+    """
+    Résultat de la comparaison de deux bases de données, sans aucun affichage.
+
+    Les comptes sont exprimés en publications (groupes résolus par PublicationClusters) et non en lignes.
+    """
+    def __init__(self, source_index: IdIndex, target_index: IdIndex, source_name: str = "Source", target_name: str = "Target",
+                 clusters: PublicationClusters = None, title_threshold: float = TITLE_MATCH_THRESHOLD, key: str = None):
+        """
+        Initialise la classe PairComparison.
+
+        Args:
+            source_index(IdIndex) : index de la base source
+            target_index(IdIndex) : index de la base cible
+            source_name(str) : nom de la source
+            target_name(str) : nom de la cible
+            clusters(PublicationClusters) : résolution des publications entre toutes les bases (optionnel)
+            title_threshold(float) : similarité minimale des titres, si clusters n'est pas fourni
+            key(str) : clé du résultat (par défaut, empreinte des deux bases et du seuil)
+        """
+        self.source_name = source_name
+        self.target_name = target_name
+        self.in_target_col = f"in_{target_name.lower()}"
+        self.matching_id_col = f"matching_id_{target_name.lower()}"
+        self.confidence_col = f"match_confidence_{target_name.lower()}"
+        self.status_col = f"statut_{target_name.lower()}"
+        self.key: str = key if key is not None else comparison_key(
+            {source_name: source_index.fingerprint, target_name: target_index.fingerprint}, title_threshold)
+
+        # Résolution transitive des publications (identifiants puis titres), limitée aux deux bases si elle n'est pas fournie
+        if clusters is None:
+            clusters = PublicationClusters({source_name: source_index, target_name: target_index}, title_threshold)
+
+        source = source_index.df.copy()
+        target = target_index.df.assign(publication_key=clusters.publication_keys(target_name))
+
+        # ---- 1. Recherche des correspondances ----
+        # Une publication est dans la cible si son groupe contient un enregistrement de la cible
+        in_target = clusters.in_database(source_name, target_name)
+        target_found = clusters.in_database(target_name, source_name)
+        found, matching_id = match_ids(source_index.long, target_index.long, len(source))
+
+        # Confiance : 1 pour un identifiant commun, score du titre pour un rapprochement direct par titre,
+        # sinon celle du groupe (rapprochement transitif par une autre base)
+        confidence = np.where(in_target, clusters.confidence[clusters.clusters_of(source_name)], np.nan)
+        title_matches = clusters.title_matches.get((source_name, target_name))
+        if title_matches is not None:
+            confidence[title_matches["source"].to_numpy()] = title_matches["confidence"].to_numpy()
+        confidence[found] = 1.0
+
+        source["publication_key"] = clusters.publication_keys(source_name)
+        source[self.in_target_col] = in_target
+        source[self.matching_id_col] = matching_id
+        source[self.confidence_col] = confidence
+        source[self.status_col] = np.where(in_target, f"Dans {target_name}", f"Pas dans {target_name}")
+
+        self.source: pd.DataFrame = source
+        self.only_source: pd.DataFrame = source[~in_target].reset_index(drop=True)
+        self.common: pd.DataFrame = source[in_target].reset_index(drop=True)
+        self.target_only: pd.DataFrame = target[~target_found]
+
+        # ---- 2. Statistiques (en publications, c'est-à-dire en groupes, et non en lignes) ----
+        source_clusters = clusters.clusters_of(source_name)
+        target_clusters = clusters.clusters_of(target_name)
+        self.n_common = len(np.unique(source_clusters[in_target]))
+        self.n_only_source = len(np.unique(source_clusters[~in_target]))
+        self.n_only_target = len(np.unique(target_clusters[~target_found]))
+        self.n_source = self.n_common + self.n_only_source
+        self.n_target = self.n_common + self.n_only_target
+        self.total_unique = self.n_only_source + self.n_only_target + self.n_common
+
+    @property
+    def overlap_rate(self) -> float:
+        """
+        Taux de recouvrement : publications communes / publications uniques des deux bases (en %).
+        """
+        return (self.n_common / self.total_unique) * 100 if self.total_unique > 0 else 0.0
+
+class _LruCache(OrderedDict):
+    """
+    Dictionnaire borné qui évince les entrées les moins récemment utilisées.
+
+    Partagé par toutes les sessions Streamlit (un fil d'exécution par session) : les accès sont protégés
+    par un verrou, le calcul d'une valeur absente se fait hors du verrou.
+    """
+    def __init__(self, max_size: int):
+        """
+        Initialise la classe _LruCache.
+
+        Args:
+            max_size(int) : nombre maximal d'entrées
+        """
+        super().__init__()
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """
+        Renvoie la valeur de key, calculée par compute() si elle n'est pas en mémoire.
+
+        Args:
+            key : clé de l'entrée
+            compute : fonction sans argument qui calcule la valeur
+
+        Return:
+            valeur de l'entrée
+        """
+        with self._lock:
+            if key in self:
+                self.move_to_end(key)
+                return self[key]
+        value = compute()
+        with self._lock:
+            self[key] = value
+            self.move_to_end(key)
+            while len(self) > self.max_size:
+                self.popitem(last=False)
+        return value
+
+_comparison_cache = _LruCache(COMPARISON_CACHE_SIZE)
+_index_cache = _LruCache(INDEX_CACHE_SIZE)
+_title_match_cache = _LruCache(TITLE_MATCH_CACHE_SIZE)
+
+def get_index(df: pd.DataFrame, fingerprint: str = None) -> IdIndex:
+    """
+    Renvoie l'index d'une base, réutilisé tant que le contenu de la base ne change pas.
+
+    Args:
+        df(pd.DataFrame) : base de données
+        fingerprint(str) : empreinte de df si elle est déjà calculée (optionnel)
+
+    Return:
+        IdIndex : index de la base (à ne pas modifier, il est partagé)
+    """
+    fingerprint = fingerprint if fingerprint is not None else frame_fingerprint(df)
+    return _index_cache.get_or_compute(fingerprint, lambda: IdIndex(df, fingerprint))
+
+def get_title_matches(source_index: IdIndex, target_index: IdIndex, title_threshold: float) -> pd.DataFrame:
+    """
+    Renvoie les rapprochements par titre de deux bases, réutilisés tant qu'aucune des deux ne change.
+
+    Args:
+        source_index(IdIndex) : index de la base source
+        target_index(IdIndex) : index de la base cible
+        title_threshold(float) : similarité minimale des titres
+
+    Return:
+        pd.DataFrame : rapprochements par titre (voir pair_title_matches)
+    """
+    key = (source_index.fingerprint, target_index.fingerprint, title_threshold)
+    return _title_match_cache.get_or_compute(key, lambda: pair_title_matches(source_index, target_index, title_threshold))
+
+class ComparisonResult:
+    """
+    Résultat de la comparaison de toutes les paires de bases de données, sans aucun affichage.
+
+    Le résultat est identifié par l'empreinte du contenu des bases (et du seuil de similarité des titres) :
+    deux appels sur les mêmes données produisent la même clé.
+
+    Les index de chaque base et les rapprochements par titre de chaque paire sont gardés par empreinte :
+    quand une base est ajoutée ou remplacée, seuls ses index et les paires qui la concernent sont recalculés.
+    La résolution union-find et l'assemblage des paires, quasi linéaires, sont refaits à chaque fois.
+    """
+    def __init__(self, databases: dict, title_threshold: float = TITLE_MATCH_THRESHOLD, fingerprints: dict = None):
+        """
+        Initialise la classe ComparisonResult.
+
+        Args:
+            databases(dict) : dictionnaire {nom de la base: pd.DataFrame}
+            title_threshold(float) : similarité minimale des titres pour rapprocher des publications sans identifiant commun
+            fingerprints(dict) : empreintes des bases si elles sont déjà calculées (optionnel)
+        """
+        fingerprints = fingerprints or {}
+        self.title_threshold = title_threshold
+        # Normalisation des identifiants une seule fois par base, partagée par toutes les paires
+        self.indexes: dict = {name: get_index(df, fingerprints.get(name)) for name, df in databases.items()}
+        self.key: str = comparison_key({name: index.fingerprint for name, index in self.indexes.items()}, title_threshold)
+        # Résolution des publications entre toutes les bases (union-find), partagée par toutes les vues
+        title_matches = {
+            (source_name, target_name): get_title_matches(self.indexes[source_name], self.indexes[target_name], title_threshold)
+            for source_name, target_name in combinations(self.indexes, 2)
+        } if title_threshold is not None else None
+        self.clusters = PublicationClusters(self.indexes, title_threshold, title_matches)
+
+        self.pairs: dict = {
+            f"{source_name}_{target_name}": PairComparison(
+                self.indexes[source_name], self.indexes[target_name], source_name, target_name,
+                clusters=self.clusters, key=f"{self.key}:{source_name}_{target_name}",
+            )
+            for source_name, target_name in combinations(self.indexes, 2)
+        }
+
+        self.recap: pd.DataFrame = pd.DataFrame([{
+            'Base 1': pair.source_name,
+            'Base 2': pair.target_name,
+            'Total articles base 1': pair.n_source,
+            'Total articles base 2': pair.n_target,
+            'Publications communes': pair.n_common,
+            'Taux de recouvrement': f"{pair.overlap_rate:.2f}%",
+        } for pair in self.pairs.values()], columns=[
+            'Base 1', 'Base 2', 'Total articles base 1', 'Total articles base 2', 'Publications communes', 'Taux de recouvrement'
+        ])
+
+        # Recoupements entre toutes les bases en une seule passe (type UpSet)
+        self.publications, self.intersections = compute_overlap(self.indexes, self.clusters)
+
+def compare_databases(databases: dict, title_threshold: float = TITLE_MATCH_THRESHOLD) -> ComparisonResult:
+    """
+    Compare toutes les paires de bases de données, en réutilisant le résultat si les données n'ont pas changé.
+
+    Les résultats sont gardés en mémoire par empreinte de contenu : une nouvelle exécution de la page
+    (clic sur un widget) avec les mêmes bases ne refait aucun calcul, et l'ajout ou le remplacement
+    d'une base ne recalcule que ce qui la concerne (voir ComparisonResult).
+
+    Args:
+        databases(dict) : dictionnaire {nom de la base: pd.DataFrame}
+        title_threshold(float) : similarité minimale des titres pour rapprocher des publications sans identifiant commun
+
+    Return:
+        ComparisonResult : résultat de la comparaison (à ne pas modifier, il est partagé)
+    """
+    fingerprints = {name: frame_fingerprint(df) for name, df in databases.items()}
+    key = comparison_key(fingerprints, title_threshold)
+    return _comparison_cache.get_or_compute(key, lambda: ComparisonResult(databases, title_threshold, fingerprints))
@@ -0,0 +1,45 @@
+import os
+
+# URL de base de chaque API. Les variables d'environnement permettent de les rediriger, par exemple vers
+# le serveur local benchmarks/replay_server.py : API_BASE_URL redirige toutes les API vers un même serveur
+# (sous les préfixes /hal, /orcid, /orcid-api et /scopus), les variables propres à une API sont prioritaires.
+DEFAULT_BASE_URLS = {
+    "hal": "https://api.archives-ouvertes.fr",
+    "orcid": "https://orcid.org",
+    "orcid-api": "https://pub.orcid.org/v3.0",
+    "scopus": "https://api.elsevier.com",
+}
+BASE_URL_VARIABLES = {
+    "hal": "HAL_API_URL",
+    "orcid": "ORCID_URL",
+    "orcid-api": "ORCID_API_URL",
+    "scopus": "SCOPUS_API_URL",
+}
+
+def base_url(api: str) -> str:
+    """
+    URL de base d'une API (lue à chaque appel : une redirection peut être activée en cours d'exécution).
+
+    Args:
+        api(str) : "hal", "orcid", "orcid-api" ou "scopus"
+
+    Return:
+        str : URL de base, sans "/" final
+    """
+    url = os.getenv(BASE_URL_VARIABLES[api])
+    if not url and os.getenv("API_BASE_URL"):
+        url = f"{os.getenv('API_BASE_URL').rstrip('/')}/{api}"
+    return (url or DEFAULT_BASE_URLS[api]).rstrip("/")
+
+def api_url(api: str, path: str = "") -> str:
+    """
+    Adresse d'une ressource d'une API.
+
+    Args:
+        api(str) : "hal", "orcid", "orcid-api" ou "scopus"
+        path(str) : chemin de la ressource
+
+    Return:
+        str : adresse complète
+    """
+    return f"{base_url(api)}/{path.lstrip('/')}"
@@ -1,7 +1,19 @@
-import requests
+from collections.abc import Iterable, Iterator
 
 import pandas as pd
 
+from ._endpoints import api_url
+from ._http import http_get
+
+# Champs demandés à l'API de recherche HAL (projection côté serveur)
+HAL_FIELDS = ["docid", "title_s", "doiId_s", "authIdHal_s", "pubmedId_id", "journalTitle_s", "journalPublisher_s",
+              "publicationDate_s", "authLastNameFirstName_s"]
+# Nombre de documents par page ; la pagination par curseur n'a pas de limite sur le nombre total
+HAL_PAGE_SIZE = 1000
+# Nombre de formes auteur par requête (authIdFormPerson_s:(a OR b ...)), pour garder une URL raisonnable
+HAL_ID_BATCH_SIZE = 50
+HAL_YEAR_FIELD = "publicationDateY_i"
+
 def base_link(prefix: str = None, query:str = None) -> dict:
     """
     Cette fonction permet de rechercher des informations de base telles que l'auteur, une recherche simple, etc.
@@ -11,16 +23,16 @@ def base_link(prefix: str = None, query:str = None) -> dict:
         query(str) : information à rechercher, paramètre pouvant être utilisé. 
     """
     # Lien de base
-    root = f"https://api.archives-ouvertes.fr/{"ref/" + prefix 
-                                            if prefix in ["anrproject","doctype","instance","metadata","structure","metadatalist","journal","domain","europeanproject","author"] 
-                                            else "search/"}"
+    root = api_url("hal", "ref/" + prefix
+                          if prefix in ["anrproject","doctype","instance","metadata","structure","metadatalist","journal","domain","europeanproject","author"]
+                          else "search/")
     endpoint = f"?q={query}&wt=json"
-    return requests.get(root+endpoint).json()
+    return http_get(root+endpoint).json()
 
 def req_id_hal(idhal:str) -> list:
-    root = "https://api.archives-ouvertes.fr/ref/author"
+    root = api_url("hal", "ref/author")
     endpoint = f"?q=idHal_s:{idhal}&wt=json"
-    req = requests.get(root+endpoint).json()
+    req = http_get(root+endpoint).json()
 
     if req["response"]["numFound"] == 0:
         return "Erreur Recherche HAL : Nous n'avons pas trouvé de données\nVérifiez les informations renseignées."
@@ -59,46 +71,152 @@ def id_author(lastName:str, firstName:str) -> list:
             id_auth.append(docid) # .split("-")[1]
     return id_auth
 
+def iter_hal_pages(query: str, fields: list = HAL_FIELDS, rows: int = HAL_PAGE_SIZE) -> Iterator[list]:
+    """
+    Parcourt tous les résultats d'une recherche HAL, page par page, avec la pagination par curseur de Solr (cursorMark).
+
+    Contrairement à start/rows, le curseur ne tronque pas les résultats et chaque page coûte autant que la première.
+
+    Args:
+        query(str) : requête Solr (paramètre q)
+        fields(list) : champs à renvoyer (paramètre fl)
+        rows(int) : nombre de documents par page
+
+    Return:
+        Iterator[list] : documents de chaque page
+    """
+    cursor = "*"
+    while True:
+        req = http_get(api_url("hal", "search/"), params={
+            "q": query,
+            "fl": ",".join(fields),
+            "rows": rows,
+            # Le curseur exige un tri sur la clé unique
+            "sort": "docid asc",
+            "cursorMark": cursor,
+            "wt": "json",
+        }).json()
+        docs = req["response"]["docs"]
+        if docs:
+            yield docs
+        next_cursor = req.get("nextCursorMark", cursor)
+        if not docs or next_cursor == cursor:
+            return
+        cursor = next_cursor
+
+# Colonnes du DataFrame HAL et valeur de chacune pour un document
+HAL_COLUMNS = {
+    "Titre Journal": lambda doc: doc.get("journalTitle_s"),
+    "Auteur": lambda doc: doc.get("authLastNameFirstName_s"),
+    "Titre Article": lambda doc: (doc.get("title_s") or [None])[0],
+    "Journal Publisher": lambda doc: doc.get("journalPublisher_s"),
+    "Date de publication": lambda doc: doc.get("publicationDate_s", "").split("-")[0],
+    "DOI": lambda doc: doc.get("doiId_s"),
+    "pubmedId": lambda doc: doc.get("pubmedId_id"),
+}
+
+def hal_docs_to_frame(docs: Iterable) -> pd.DataFrame:
+    """
+    Convertit des documents HAL en colonnes, en un seul parcours : chaque document n'est lu qu'une fois
+    (il peut venir d'un itérateur de pages, sans que toutes les pages soient gardées).
+
+    Args:
+        docs(Iterable) : documents renvoyés par l'API de recherche HAL
+
+    Return:
+        pd.DataFrame : une ligne par document
+    """
+    columns = {column: [] for column in HAL_COLUMNS}
+    for doc in docs:
+        for column, value in HAL_COLUMNS.items():
+            columns[column].append(value(doc))
+    return pd.DataFrame(columns)
+
+def hal_author_query(ids: list) -> str:
+    """
+    Construit une requête Solr sur plusieurs formes auteur.
+
+    Args:
+        ids(list) : identifiants des formes auteur (docid)
+
+    Return:
+        str : requête authIdFormPerson_s:("a" OR "b" ...)
+    """
+    quoted = " OR ".join(f'"{id}"' for id in ids)
+    return f"authIdFormPerson_s:({quoted})"
+
+def iter_hal_publications(ids: list) -> Iterator[list]:
+    """
+    Récupère les publications de formes auteur HAL, page par page.
+
+    Une seule requête par lot de HAL_ID_BATCH_SIZE formes : une publication signée sous plusieurs formes
+    n'est renvoyée qu'une fois par lot, et les doublons entre lots sont écartés par docid.
+
+    Args:
+        ids(list) : identifiants des formes auteur (docid)
+
+    Return:
+        Iterator[list] : documents de chaque page, sans doublon
+    """
+    seen = set()
+    for start in range(0, len(ids), HAL_ID_BATCH_SIZE):
+        for docs in iter_hal_pages(hal_author_query(ids[start:start + HAL_ID_BATCH_SIZE])):
+            new_docs = [doc for doc in docs if doc["docid"] not in seen]
+            seen.update(doc["docid"] for doc in new_docs)
+            if new_docs:
+                yield new_docs
+
+def hal_publication_years(ids: list) -> pd.Series:
+    """
+    Nombre de publications par année de formes auteur HAL (facette calculée par le serveur, sans télécharger les documents).
+    Au-delà de HAL_ID_BATCH_SIZE formes, une publication signée sous des formes de lots différents est comptée par lot.
+
+    Args:
+        ids(list) : identifiants des formes auteur (docid)
+
+    Return:
+        pd.Series : nombre de publications indexé par année
+    """
+    counts = {}
+    for start in range(0, len(ids), HAL_ID_BATCH_SIZE):
+        req = http_get(api_url("hal", "search/"), params={
+            "q": hal_author_query(ids[start:start + HAL_ID_BATCH_SIZE]),
+            "rows": 0,
+            "facet": "true",
+            "facet.field": HAL_YEAR_FIELD,
+            "facet.limit": -1,
+            "facet.mincount": 1,
+            "wt": "json",
+        }).json()
+        # Solr renvoie la facette à plat : [valeur, nombre, valeur, nombre, ...]
+        facet = req["facet_counts"]["facet_fields"][HAL_YEAR_FIELD]
+        for year, count in zip(facet[::2], facet[1::2]):
+            counts[int(year)] = counts.get(int(year), 0) + count
+    return pd.Series(counts, name="Publications", dtype="int64").rename_axis("Année").sort_index()
+
 def get_hal_researcher_data(lastName:str = None, firstName:str = None, idhal:str = None) -> pd.DataFrame:
     """
-    Cette fonction permet de rechercher les identifiants des auteurs que vous souhaitez.
+    Cette fonction permet de rechercher les publications d'un auteur, par idHAL ou par nom et prénom.
     
     Args :
         lastName(str) : Nom de l'auteur
         firstName(str) : prénom de l'auteur
+        idhal(str) : identifiant HAL de l'auteur (prioritaire sur le nom)
     
     Return:
-        pd.DataFrame : DataFrame avec les données de l'auteur
+        pd.DataFrame : DataFrame avec les données de l'auteur (ou message d'erreur)
     """
 
     # authIdForm_i:158428 -> Marc Humbert -> 449
-    if lastName and firstName:
-        ids = id_author(lastName = lastName, firstName=firstName)
     if idhal:
         ids = req_id_hal(idhal=idhal)
+    elif lastName and firstName:
+        ids = id_author(lastName = lastName, firstName=firstName)
     else:
         return "Erreur Recherche HAL : Veuillez renseigner le nom et le prénom ou l'ID HAL."
 
-    if isinstance(ids, list):
-        data_hal = []
-        for id in ids:
-            req = base_link(query=f"authIdFormPerson_s:{id}&fl=title_s,doiId_s,authIdHal_s,pubmedId_id,journalTitle_s,journalPublisher_s,publicationDate_s,authLastNameFirstName_s&start=0&rows=1000")
-            docs = req["response"]["docs"]
-            for doc in docs:
-                title_s = doc["title_s"][0]
-                journalTitle_s = doc.get("journalTitle_s", None)
-                journalPublisher_s = doc.get("journalPublisher_s", None)
-                publicationDate_s = doc["publicationDate_s"].split("-")[0]
-                doiId_s = doc.get("doiId_s", None)
-                pubmedId_id = doc.get("pubmedId_id", None)
-                authLastNameFirstName_s = doc.get("authLastNameFirstName_s", None)
-                data_hal.append({
-                    "Titre Journal": journalTitle_s,
-                    "Auteur" : authLastNameFirstName_s,
-                    "Titre Article": title_s,
-                    "Journal Publisher" : journalPublisher_s,
-                    "Date de publication" : publicationDate_s,
-                    "DOI": doiId_s,
-                    "pubmedId": pubmedId_id
-                })
-    return pd.DataFrame(data_hal)
\ No newline at end of file
+    if not isinstance(ids, list):
+        return ids
+
+    # Les pages sont converties au fil de la pagination : seules les colonnes du résultat sont gardées
+    return hal_docs_to_frame(doc for docs in iter_hal_publications(ids) for doc in docs)
@@ -0,0 +1,130 @@
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ._cache import cache_key, response_cache, source_ttl
+from ._ratelimit import limiter_key, rate_limiter
+
+# Délais (connexion, lecture) en secondes : un appel lent ne bloque plus indéfiniment la page
+HTTP_TIMEOUT = (float(os.getenv("HTTP_CONNECT_TIMEOUT", 5)), float(os.getenv("HTTP_READ_TIMEOUT", 60)))
+# Nouvelles tentatives sur erreurs serveur, avec attente exponentielle (0.5 s, 1 s, 2 s...) ou Retry-After.
+# Les refus 429 sont retentés par http_get au rythme du limiteur (voir _ratelimit), qui doit les voir passer.
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 4))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", 0.5))
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Nombre maximal de requêtes simultanées par hôte (et taille du pool de connexions gardées ouvertes)
+HOST_LIMITS = {
+    "api.archives-ouvertes.fr": 4,
+    "api.elsevier.com": 4,
+    "orcid.org": 8,
+    "pub.orcid.org": 8,
+}
+DEFAULT_HOST_LIMIT = 4
+
+class ServerErrorRetry(Retry):
+    """
+    Nouvelles tentatives de urllib3 limitées aux erreurs serveur : même avec Retry-After,
+    un 429 est renvoyé à http_get pour que le limiteur de débit en tienne compte.
+    """
+    RETRY_AFTER_STATUS_CODES = frozenset({503})
+
+_local = {"pid": None, "session": None, "semaphores": {}}
+_lock = threading.Lock()
+
+def _session() -> requests.Session:
+    """
+    Session HTTP partagée du processus (recréée après un fork, un pool de connexions ne se partage pas).
+
+    Return:
+        requests.Session : session avec connexions persistantes et nouvelles tentatives
+    """
+    with _lock:
+        if _local["pid"] != os.getpid():
+            retry = ServerErrorRetry(
+                total=HTTP_RETRIES,
+                # Un délai de lecture dépassé n'est retenté qu'une fois : sinon l'attente est multipliée
+                read=1,
+                backoff_factor=HTTP_BACKOFF,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({"GET"}),
+                respect_retry_after_header=True,
+                # Après la dernière tentative, la réponse en erreur est renvoyée à l'appelant
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=len(HOST_LIMITS) + 1,
+                                  pool_maxsize=max([*HOST_LIMITS.values(), DEFAULT_HOST_LIMIT]),
+                                  max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _local.update(pid=os.getpid(), session=session, semaphores={})
+        return _local["session"]
+
+def _host_semaphore(host: str) -> threading.BoundedSemaphore:
+    """
+    Sémaphore limitant les requêtes simultanées vers un hôte.
+
+    Args:
+        host(str) : nom d'hôte
+
+    Return:
+        threading.BoundedSemaphore : sémaphore de l'hôte
+    """
+    with _lock:
+        semaphores = _local["semaphores"]
+        if host not in semaphores:
+            semaphores[host] = threading.BoundedSemaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+        return semaphores[host]
+
+def http_get(url: str, params: dict = None, headers: dict = None, timeout: tuple = None, ttl: int = None) -> requests.Response:
+    """
+    Requête GET via le client HTTP partagé par toutes les récupérations (HAL, ORCID, Scopus).
+
+    Les réponses 200 sont gardées dans le cache persistant (voir _cache) : tant qu'elles sont valides,
+    l'API n'est pas interrogée ; ensuite, elles sont revalidées par ETag / Last-Modified quand c'est possible.
+    Les requêtes envoyées passent par le limiteur de débit de l'API (voir _ratelimit) ; un refus 429 est
+    retenté jusqu'à HTTP_RETRIES fois, quand le limiteur l'autorise.
+
+    Args:
+        url(str) : adresse
+        params(dict) : paramètres de la requête (optionnel)
+        headers(dict) : en-têtes (optionnel)
+        timeout(tuple) : délais (connexion, lecture) en secondes (par défaut HTTP_TIMEOUT)
+        ttl(int) : durée de validité en cache, en secondes (par défaut celle de l'hôte, 0 pour ne pas utiliser le cache)
+
+    Return:
+        requests.Response : réponse (après les éventuelles nouvelles tentatives) ; RateLimitExceeded est levée
+            si le quota de l'API est épuisé pour plus de RATE_LIMIT_MAX_WAIT secondes
+    """
+    ttl = source_ttl(url) if ttl is None else ttl
+    cache = response_cache() if ttl else None
+    key = cache_key(url, params, headers) if cache is not None else None
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None and cached.is_fresh(ttl):
+        return cached.to_response()
+
+    request_headers = dict(headers or {})
+    if cached is not None:
+        request_headers.update(cached.validators())
+
+    session = _session()
+    limiter, api = rate_limiter(), limiter_key(url)
+    for _ in range(HTTP_RETRIES + 1):
+        limiter.acquire(api)
+        with _host_semaphore(urlsplit(url).hostname):
+            response = session.get(url, params=params, headers=request_headers, timeout=timeout or HTTP_TIMEOUT)
+        limiter.observe(api, response)
+        if response.status_code != 429:
+            break
+
+    if cached is not None and response.status_code == 304:
+        cache.refresh(key)
+        return cached.to_response()
+    if cache is not None and response.status_code == 200:
+        cache.store(key, response)
+    return response
@@ -0,0 +1,399 @@
+import re
+from urllib.parse import unquote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Colonnes d'identifiants canoniques ajoutées par create_id_column et leur type
+ID_COLUMNS = {
+    "doi_norm": "string[pyarrow]",
+    "pmid": "Int64",
+    "wos_ut": "string[pyarrow]",
+    "scopus_eid": "string[pyarrow]",
+}
+
+# Type d'identifiant ORCID ("external-id-type") de chaque colonne canonique
+ORCID_ID_TYPES = {
+    "doi_norm": "doi",
+    "pmid": "pmid",
+    "wos_ut": "wosuid",
+    "scopus_eid": "eid",
+}
+
+# Préfixe de chaque type d'identifiant dans la table longue
+ID_PREFIXES = {
+    "doi_norm": "doi",
+    "pmid": "pmid",
+    "wos_ut": "wos",
+    "scopus_eid": "eid",
+}
+
+# Nombre maximal de DOI mémorisés entre deux appels (valeurs répétées d'une base à l'autre)
+DOI_MEMO_SIZE = 200_000
+
+# Expressions régulières du DOI (moteur RE2 de pyarrow, compilées une fois pour toute la colonne).
+# DOI canonique : "10.<préfixe>/<suffixe>", quel que soit l'habillage (doi:, https://doi.org/, dx.doi.org, etc.)
+_DOI_PATTERN = r"10\.\d+(?:\.\d+)*/\S+"
+_DOI_PREFIX = r"^(?:(?:https?://)?(?:(?:dx|www)\.)?doi\.org/|(?:urn:|info:)?doi(?::|/|\s)*)"
+_TRAILING_PUNCTUATION = ".,;:'\""
+# Mêmes expressions pour une valeur seule (module re ; ASCII comme RE2 pour \d et \s)
+_DOI_MATCH = re.compile("^" + _DOI_PATTERN, re.ASCII)
+_DOI_PREFIX_MATCH = re.compile(_DOI_PREFIX, re.ASCII)
+_DOI_SEARCH = re.compile(rf"^.*?({_DOI_PATTERN})", re.ASCII)
+_SPACES = re.compile(r"\s", re.ASCII)
+# PMID : entier seul, éventuellement préfixé ("PMID: 123")
+_PMID_PATTERN = r"(?i)^(?:pmid\s*:?\s*)?(\d+)(?:\.0+)?$"
+# Borne des PMID acceptés : en deçà, un flottant représente l'entier exactement
+PMID_MAX = 2 ** 53
+
+class _DoiMemo:
+    """
+    Mémo borné des DOI déjà normalisés, du moins récemment utilisé au plus récemment utilisé.
+
+    Les recherches et mises à jour se font sur des colonnes entières (tables de hachage pyarrow).
+    Le mémo est partagé par toutes les sessions et tous les fils d'exécution : les deux colonnes forment un
+    seul tuple (valeurs brutes, DOI canoniques), lu une fois par opération et remplacé d'un bloc, de sorte
+    qu'une recherche ne mélange jamais les colonnes de deux états. Une mise à jour concurrente peut en
+    écraser une autre, ce qui ne coûte que des valeurs à recalculer.
+    """
+    def __init__(self, max_size: int):
+        """
+        Initialise la classe _DoiMemo.
+
+        Args:
+            max_size(int) : nombre maximal de valeurs mémorisées
+        """
+        self.max_size = max_size
+        self.clear()
+
+    def clear(self):
+        """
+        Vide le mémo.
+        """
+        self.entries = (pa.array([], type=pa.large_string()), pa.array([], type=pa.large_string()))
+
+    def lookup(self, raw: pa.Array) -> tuple[pa.Array, pa.Array]:
+        """
+        Recherche des valeurs brutes dans le mémo.
+
+        Args:
+            raw(pa.Array) : valeurs brutes distinctes
+
+        Return:
+            tuple[pa.Array, pa.Array] : masque des valeurs trouvées et DOI canoniques correspondants
+        """
+        memo_raw, memo_canonical = self.entries
+        position = pc.index_in(raw, value_set=memo_raw)
+        return pc.is_valid(position), pc.take(memo_canonical, position)
+
+    def store(self, raw: pa.Array, canonical: pa.Array):
+        """
+        Place les valeurs utilisées en fin de mémo puis évince les plus anciennes.
+
+        Args:
+            raw(pa.Array) : valeurs brutes distinctes
+            canonical(pa.Array) : DOI canoniques correspondants
+        """
+        memo_raw, memo_canonical = self.entries
+        start = max(0, len(raw) - self.max_size)
+        raw, canonical = raw[start:], canonical[start:]
+        kept = pc.invert(pc.is_in(memo_raw, value_set=raw))
+        raw = pa.concat_arrays([pc.filter(memo_raw, kept), raw])
+        canonical = pa.concat_arrays([pc.filter(memo_canonical, kept), canonical])
+        start = max(0, len(raw) - self.max_size)
+        self.entries = (raw[start:], canonical[start:])
+
+_doi_memo = _DoiMemo(DOI_MEMO_SIZE)
+
+def normalize_doi(doi_str)  -> str:
+    """
+    Normalise un DOI pour améliorer la correspondance (voir normalize_doi_series pour une colonne entière).
+
+    Les règles sont celles de _canonical_doi, appliquées directement à la chaîne : une valeur seule ne passe
+    ni par pyarrow ni par le mémo des colonnes.
+
+    Args:
+        doi_str(str) : DOI à normaliser.
+
+    Return:
+        str : DOI normalisé.
+    """
+    if not isinstance(doi_str, str):
+        return doi_str
+
+    value = doi_str.strip()
+    if value in ("", "[]", "nan", "None"):
+        return None
+    value = value.lower()
+    if "%" in value:
+        value = unquote(value)
+    value = _SPACES.sub("", value)
+    if not value.startswith("10."):
+        value = _DOI_PREFIX_MATCH.sub("", value, count=1)
+    if not value.startswith("10."):
+        value = _DOI_SEARCH.sub(r"\1", value, count=1)
+    if not _DOI_MATCH.match(value):
+        return None
+
+    value = value.rstrip(_TRAILING_PUNCTUATION)
+    if value.endswith(")") and value.count("(") < value.count(")"):
+        value = value[:-1].rstrip(_TRAILING_PUNCTUATION)
+    return value
+
+def _as_string(values: pd.Series) -> pd.Series:
+    """
+    Convertit une colonne en chaînes de caractères nettoyées, les valeurs vides devenant manquantes.
+
+    Args:
+        values(pd.Series) : colonne à convertir.
+
+    Return:
+        pd.Series : colonne de type string[pyarrow].
+    """
+    values = values.astype("string[pyarrow]").str.strip()
+    return values.mask((values == "") | (values == "[]") | (values == "nan") | (values == "None"))
+
+def arrow_strings(values: pd.Series) -> pa.Array:
+    """
+    Renvoie le tableau pyarrow (large_string) d'une colonne de chaînes de caractères.
+
+    Args:
+        values(pd.Series) : colonne à convertir.
+
+    Return:
+        pa.Array : valeurs au format pyarrow.
+    """
+    array = values.astype("string[pyarrow]").array.__arrow_array__()
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    return array.cast(pa.large_string())
+
+def _replace_where(values: pa.Array, mask: pa.Array, func) -> pa.Array:
+    """
+    Applique une transformation aux seules valeurs sélectionnées.
+
+    Args:
+        values(pa.Array) : valeurs
+        mask(pa.Array) : masque des valeurs à transformer
+        func(callable) : transformation appliquée au sous-ensemble sélectionné
+
+    Return:
+        pa.Array : valeurs transformées
+    """
+    mask = pc.fill_null(mask, False)
+    if not pc.any(mask).as_py():
+        return values
+    return pc.replace_with_mask(values, mask, func(pc.filter(values, mask)).cast(values.type))
+
+def _canonical_doi(values: pa.Array) -> pa.Array:
+    """
+    Applique les règles de canonicalisation du DOI à des valeurs distinctes.
+
+    Les étapes coûteuses ne sont appliquées qu'aux valeurs qui en ont besoin.
+
+    Args:
+        values(pa.Array) : DOI bruts.
+
+    Return:
+        pa.Array : DOI canoniques (nuls si la valeur ne contient pas de DOI).
+    """
+    values = pc.utf8_lower(values)
+
+    # Caractères encodés dans les URL (ex: %2F), rares : décodage au cas par cas
+    values = _replace_where(values, pc.match_substring(values, "%"),
+                            lambda encoded: pa.array([unquote(value) for value in encoded.to_pylist()], type=encoded.type))
+
+    # Un DOI ne contient pas d'espace
+    values = _replace_where(values, pc.match_substring_regex(values, r"\s"),
+                            lambda spaced: pc.replace_substring_regex(spaced, r"\s", ""))
+
+    # Préfixes usuels, puis recherche du DOI dans le reste de la valeur (URL d'éditeur, etc.)
+    values = _replace_where(values, pc.invert(pc.starts_with(values, "10.")),
+                            lambda prefixed: pc.replace_substring_regex(prefixed, _DOI_PREFIX, ""))
+    values = _replace_where(values, pc.invert(pc.starts_with(values, "10.")),
+                            lambda prefixed: pc.replace_substring_regex(prefixed, rf"^.*?({_DOI_PATTERN})", r"\1"))
+    values = pc.if_else(pc.match_substring_regex(values, "^" + _DOI_PATTERN), values, pa.scalar(None, type=values.type))
+
+    values = pc.utf8_rtrim(values, _TRAILING_PUNCTUATION)
+
+    # Parenthèse fermante finale sans parenthèse ouvrante correspondante (DOI cité entre parenthèses)
+    unbalanced = pc.and_(pc.ends_with(values, ")"),
+                         pc.less(pc.count_substring(values, "("), pc.count_substring(values, ")")))
+    return _replace_where(values, unbalanced,
+                          lambda quoted: pc.utf8_rtrim(pc.utf8_slice_codeunits(quoted, 0, -1), _TRAILING_PUNCTUATION))
+
+def normalize_doi_series(values: pd.Series) -> pd.Series:
+    """
+    Normalise une colonne entière de DOI.
+
+    Les formes courantes sont ramenées au DOI nu en minuscules ("10.xxxx/yyyy") : préfixes doi:,
+    https://doi.org/, http://dx.doi.org/, caractères encodés dans les URL, espaces et ponctuation finale.
+    Chaque valeur distincte n'est traitée qu'une fois et les derniers résultats sont mémorisés
+    (DOI_MEMO_SIZE valeurs au plus) pour les DOI qui se répètent d'une base à l'autre.
+
+    Args:
+        values(pd.Series) : colonne de DOI.
+
+    Return:
+        pd.Series : DOI normalisés (string[pyarrow]).
+    """
+    values = _as_string(values)
+    encoded = pc.dictionary_encode(arrow_strings(values))
+    uniques = encoded.dictionary
+
+    found, canonical = _doi_memo.lookup(uniques)
+    missing = pc.invert(found)
+    if pc.any(missing).as_py():
+        canonical = pc.replace_with_mask(canonical, missing, _canonical_doi(pc.filter(uniques, missing)))
+    _doi_memo.store(uniques, canonical)
+
+    result = pc.take(canonical, encoded.indices)
+    return pd.Series(pd.arrays.ArrowStringArray(result), index=values.index)
+
+def normalize_pmid_series(values: pd.Series) -> pd.Series:
+    """
+    Normalise une colonne d'identifiants PubMed en entiers.
+
+    Args:
+        values(pd.Series) : colonne d'identifiants PubMed (nombres ou textes tels que "PMID:123").
+
+    Return:
+        pd.Series : identifiants PubMed (Int64), manquants pour les valeurs qui ne sont pas un entier positif.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = pd.to_numeric(values, errors="coerce")
+    else:
+        # La valeur entière doit être un nombre ("12.5" ou "PMC123/456" ne sont pas des PMID) ; "123.0" vient
+        # d'une colonne Excel mêlant nombres et textes
+        digits = _as_string(values).str.extract(_PMID_PATTERN, expand=False)
+        numbers = pd.to_numeric(digits, errors="coerce")
+    # Les valeurs décimales, négatives ou hors de la plage exacte des flottants ne sont pas des identifiants PubMed valides
+    valid = (numbers == np.floor(numbers)) & (numbers > 0) & (numbers < PMID_MAX)
+    return numbers.where(valid).astype("Int64")
+
+def normalize_wos_series(values: pd.Series) -> pd.Series:
+    """
+    Normalise une colonne d'identifiants Web of Science (UT) sans le préfixe "WOS:".
+
+    Args:
+        values(pd.Series) : colonne d'identifiants WoS.
+
+    Return:
+        pd.Series : identifiants WoS (string[pyarrow]).
+    """
+    values = _as_string(values).str.upper().str.replace(r"^WOS:", "", regex=True).str.strip()
+    return values.mask(values == "")
+
+def normalize_scopus_series(values: pd.Series) -> pd.Series:
+    """
+    Normalise une colonne d'identifiants Scopus sous la forme EID ("2-s2.0-<numéro>").
+
+    Args:
+        values(pd.Series) : colonne d'identifiants Scopus ("SCOPUS_ID:<numéro>", EID ou numéro seul).
+
+    Return:
+        pd.Series : EID Scopus (string[pyarrow]).
+    """
+    numbers = _as_string(values).str.extract(r"(\d+)$", expand=False)
+    return ("2-s2.0-" + numbers).astype("string[pyarrow]")
+
+def find_id_columns(df: pd.DataFrame) -> dict:
+    """
+    Identifie les colonnes sources de chaque type d'identifiant.
+
+    Args:
+        df(pd.DataFrame) : DataFrame à analyser.
+
+    Return:
+        dict : dictionnaire {colonne canonique: liste des colonnes sources par ordre de priorité}
+    """
+    mapping = {id_col: [] for id_col in ID_COLUMNS}
+    for col in df.columns:
+        if not isinstance(col, str) or col in ID_COLUMNS:
+            continue
+        col_lower = col.lower()
+
+        if "doi" in col_lower:
+            mapping["doi_norm"].append(col)
+        elif "pubmed" in col_lower or col_lower == "pmid":
+            mapping["pmid"].append(col)
+        elif "ut (unique" in col_lower or "wosuid" in col_lower:
+            mapping["wos_ut"].append(col)
+        elif "scopus_id" in col_lower or col_lower == "eid":
+            mapping["scopus_eid"].append(col)
+    return mapping
+
+def create_id_column(df) -> pd.DataFrame:
+    """
+    Crée les colonnes d'identifiants canoniques typées : doi_norm, pmid, wos_ut et scopus_eid.
+
+    Lorsque plusieurs colonnes portent le même type d'identifiant (ex: "DOI" et "DOI Link"),
+    la première valeur renseignée est conservée.
+
+    Args:
+        df(pd.DataFrame) : DataFrame à modifier.
+
+    Return:
+        pd.DataFrame : DataFrame modifié.
+    """
+    # Vérifier si l'objet est un DataFrame
+    if not isinstance(df, pd.DataFrame):
+
+        # Convertir en DataFrame si c'est une liste de dictionnaires
+        if isinstance(df, list) and df and isinstance(df[0], dict):
+            df = pd.DataFrame(df)
+        else:
+            # Si ce n'est pas une liste de dictionnaires, créer un DataFrame vide
+            df = pd.DataFrame()
+
+    normalizers = {
+        "doi_norm": normalize_doi_series,
+        "pmid": normalize_pmid_series,
+        "wos_ut": normalize_wos_series,
+        "scopus_eid": normalize_scopus_series,
+    }
+    # Format long d'ORCID : une colonne "type" (doi, pmid, wosuid, eid) et une colonne "value"
+    id_types = df["type"].astype("string[pyarrow]").str.lower() if {"type", "value"} <= set(df.columns) else None
+
+    for id_col, source_cols in find_id_columns(df).items():
+        canonical = pd.Series(pd.NA, index=df.index, dtype=ID_COLUMNS[id_col])
+        for col in source_cols:
+            canonical = canonical.fillna(normalizers[id_col](df[col]))
+        if id_types is not None:
+            typed_values = df["value"].where((id_types == ORCID_ID_TYPES[id_col]).fillna(False))
+            canonical = canonical.fillna(normalizers[id_col](typed_values))
+        df[id_col] = canonical
+    return df
+
+def id_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Construit la table longue (ligne, identifiant) d'un DataFrame passé par create_id_column.
+
+    Chaque identifiant est préfixé par son type ("doi:", "pmid:", "wos:", "eid:") pour que les jointures
+    ne comparent que des identifiants de même nature.
+
+    Args:
+        df(pd.DataFrame) : DataFrame contenant les colonnes d'identifiants canoniques.
+
+    Return:
+        pd.DataFrame : DataFrame avec les colonnes "row" (position de la ligne), "type" et "id".
+    """
+    parts = []
+    for id_col, prefix in ID_PREFIXES.items():
+        if id_col not in df.columns:
+            continue
+        values = df[id_col].astype("string[pyarrow]").reset_index(drop=True)
+        values = values[values.notna()]
+        parts.append(pd.DataFrame({
+            "row": values.index.to_numpy(dtype="int64"),
+            "type": id_col,
+            "id": (prefix + ":" + values).to_numpy(dtype=object),
+        }))
+
+    if not parts:
+        return pd.DataFrame({"row": pd.Series(dtype="int64"), "type": pd.Series(dtype=object), "id": pd.Series(dtype=object)})
+
+    # Tri stable par ligne : l'ordre des types (DOI, PubMed, WoS, Scopus) est conservé dans chaque ligne
+    return pd.concat(parts, ignore_index=True).sort_values("row", kind="stable").reset_index(drop=True)
@@ -1,6 +1,16 @@
-import streamlit as st
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
+import requests
+
+from ._endpoints import api_url
+from ._http import http_get
+
+# Nombre maximal de put-codes par requête groupée works/{a,b,...} (limite de l'API ORCID)
+ORCID_BULK_SIZE = 100
+# Nombre de requêtes groupées envoyées en parallèle
+ORCID_WORKERS = 4
 
 class Orcid_Researcher:
     """
@@ -9,9 +19,20 @@ class Orcid_Researcher:
     Elle fournit des méthodes pour :
     - Récupérer les données depuis l'ORCID
     - Transformer les données récupérées en DataFrame
+
+    Par défaut, seul le résumé du profil est récupéré. Avec full_works=True, le détail de chaque travail
+    (contributeurs, identifiants externes de toutes les versions) est récupéré par lots de ORCID_BULK_SIZE.
     """
-    def __init__(self, orcid_link:str):
+    def __init__(self, orcid_link:str, full_works: bool = False):
+        """
+        Initialise la classe Orcid_Researcher.
+
+        Args:
+            orcid_link(str) : URL du profil ORCID (https://orcid.org/...)
+            full_works(bool) : récupérer le détail complet de chaque travail
+        """
         self.orcid_link = orcid_link
+        self.full_works = full_works
         self.df_orcid:pd.DataFrame = self.extract_ids_from_orcids()
         
     def req_orcid(self) -> dict:
@@ -22,60 +43,129 @@ class Orcid_Researcher:
             dict : données de l'ORCID
         """
         if "https://orcid.org/" in self.orcid_link:
-            return requests.get(self.orcid_link,headers={'Accept':'application/json'}).json()
+            orcid_id = self.orcid_link.rstrip("/").split("/")[-1]
+            return http_get(api_url("orcid", orcid_id),headers={'Accept':'application/json'}).json()
         else:
+            # Streamlit n'est importé que pour afficher l'erreur : le module reste utilisable sans interface
+            import streamlit as st
             st.write("Pour Orcid :")
             return st.error("L'URL doit contenir https://orcid.org/")
 
+    def req_works(self, put_codes: list) -> dict:
+        """
+        Récupère le détail des travaux par lots (works/{put-code,put-code,...}), ORCID_WORKERS lots à la fois.
+        Un lot refusé par l'API, ou un travail en erreur dans un lot accepté, lève une erreur listant les
+        put-codes concernés : le détail n'est jamais incomplet sans message.
+
+        Args:
+            put_codes(list) : put-codes des travaux
+
+        Return:
+            dict : {put-code: travail}
+        """
+        orcid_id = self.orcid_link.rstrip("/").split("/")[-1]
+        batches = [put_codes[start:start + ORCID_BULK_SIZE] for start in range(0, len(put_codes), ORCID_BULK_SIZE)]
+
+        def req_batch(batch: list) -> requests.Response:
+            return http_get(api_url("orcid-api", f"{orcid_id}/works/{','.join(str(put_code) for put_code in batch)}"),
+                            headers={'Accept': 'application/json'})
+
+        works, failed, detail, last_resp = {}, [], None, None
+        with ThreadPoolExecutor(max_workers=ORCID_WORKERS) as executor:
+            for batch, resp in zip(batches, executor.map(req_batch, batches)):
+                if resp.status_code != 200:
+                    # Tous les lots sont tentés avant l'erreur, pour la signaler en une fois
+                    failed += batch
+                    detail, last_resp = f"{resp.status_code} : {resp.reason}", resp
+                    continue
+                for item in resp.json().get("bulk", []):
+                    work = item.get("work")
+                    if work:
+                        works[work["put-code"]] = work
+                    elif item.get("error"):
+                        error = item["error"]
+                        detail = f"{error.get('response-code')} : {error.get('developer-message') or error.get('user-message')}"
+                        last_resp = resp
+                # Un lot accepté peut contenir des erreurs par travail (sans put-code) : les travaux absents de la réponse
+                missing = [put_code for put_code in batch if put_code not in works]
+                if missing:
+                    failed += missing
+                    detail, last_resp = detail or "travaux absents de la réponse", resp
+        if failed:
+            # Les dix premiers put-codes suffisent à retrouver les travaux concernés sans noyer le message
+            listed = ", ".join(str(code) for code in failed[:10]) + (", ..." if len(failed) > 10 else "")
+            raise requests.HTTPError(f"Erreur de l'API ORCID ({detail}) pour {len(failed)} travaux sur {len(put_codes)} "
+                                     f"(put-codes {listed}).", response=last_resp)
+        return works
+
+    def group_external_ids(self, group: dict, works: dict) -> tuple[list, str]:
+        """
+        Identifiants externes d'un groupe de travaux et, si le détail des travaux est connu, leurs contributeurs.
+
+        Args:
+            group(dict) : groupe de travaux du résumé ORCID
+            works(dict) : détail des travaux {put-code: travail} (vide en mode résumé)
+
+        Return:
+            tuple[list, str] : (identifiants externes, auteurs séparés par "; " ou None)
+        """
+        external_ids = (group.get('external-ids') or {}).get("external-id") or []
+        details = [works[summary["put-code"]] for summary in group["work-summary"] if summary["put-code"] in works]
+        if not details:
+            return external_ids, None
+
+        # Identifiants de toutes les versions du travail (sans doublon) et contributeurs de la première version qui en a
+        all_ids = external_ids + [external_id for work in details
+                                  for external_id in ((work.get("external-ids") or {}).get("external-id") or [])]
+        external_ids = list({(i["external-id-type"], i["external-id-value"]): i for i in all_ids}.values())
+        contributors = next((work["contributors"]["contributor"] for work in details
+                             if (work.get("contributors") or {}).get("contributor")), [])
+        authors = "; ".join((contributor.get("credit-name") or {}).get("value", "") for contributor in contributors) or None
+        return external_ids, authors
+
     def extract_ids_from_orcids(self) -> pd.DataFrame:
         """
-        Extrait les identifiants de l'ORCID.
+        Extrait les identifiants de l'ORCID : une ligne par identifiant externe de chaque travail.
         
         Returns :
             pd.DataFrame : DataFrame avec les identifiants de l'ORCID
         """
         response_json = self.req_orcid()
-        if isinstance(response_json, dict):
-            doi_orcid_list = []
-            id_type_list = []
-            path_list = []
-            title_list = []
-            journal_title_list = []
-            year_list = []
-
-            path_json = response_json['activities-summary']['works']['group']
-
-            for nb_publi in range(0, len(path_json)):
-                # On prend seulement le premier work-summary car c'est le même pour chaque groupe
-                work_summary = path_json[nb_publi]["work-summary"][0]
-                
-                # Récupération des informations de base
-                year = (work_summary["publication-date"].get("year", "NaN"))["value"]
-                path = work_summary["path"]
-                title = work_summary["title"]["title"]["value"]
-                journal_title = work_summary.get('journal-title') or {}
-                journal_title = journal_title.get("value", "NaN")
-
-                # Pour chaque identifiant externe
-                external_ids = path_json[nb_publi]['external-ids']["external-id"]
-                for id in range(0, len(external_ids)):
-                    year_list.append(year)
-                    path_list.append(path)
-                    title_list.append(title)
-                    journal_title_list.append(journal_title)
-                    id_type_list.append(external_ids[id]["external-id-type"])
-                    doi_orcid_list.append(external_ids[id]["external-id-value"])
-            return pd.DataFrame(data={
-                "Titre Article": title_list,
-                "Titre Journal": journal_title_list,
-                "Orcid path": path_list,
-                "type": id_type_list,
-                "value": doi_orcid_list,
-                "Date de publication": year_list
-            }).sort_values("type").reset_index(drop=True)
-
-        else:   
-            return None            
+        if not isinstance(response_json, dict):
+            return None
+
+        groups = response_json['activities-summary']['works']['group']
+        works = {}
+        if self.full_works:
+            works = self.req_works([summary["put-code"] for group in groups for summary in group["work-summary"]])
+
+        # ---- 1. Informations de base de chaque groupe (le premier work-summary, le même pour tout le groupe) ----
+        summaries = [group["work-summary"][0] for group in groups]
+        metadata = {
+            "Titre Article": [summary["title"]["title"]["value"] for summary in summaries],
+            "Titre Journal": [(summary.get('journal-title') or {}).get("value", "NaN") for summary in summaries],
+            "Orcid path": [summary["path"] for summary in summaries],
+            "Date de publication": [((summary.get("publication-date") or {}).get("year") or {}).get("value", "NaN")
+                                    for summary in summaries],
+        }
+
+        # ---- 2. Identifiants externes à plat, puis répétition des informations du groupe ----
+        ids_and_authors = [self.group_external_ids(group, works) for group in groups]
+        group_of = np.repeat(np.arange(len(groups)), [len(external_ids) for external_ids, _ in ids_and_authors])
+        flat_ids = [external_id for external_ids, _ in ids_and_authors for external_id in external_ids]
+
+        data = {
+            "Titre Article": np.array(metadata["Titre Article"], dtype=object)[group_of],
+            "Titre Journal": np.array(metadata["Titre Journal"], dtype=object)[group_of],
+            "Orcid path": np.array(metadata["Orcid path"], dtype=object)[group_of],
+            "type": [external_id["external-id-type"] for external_id in flat_ids],
+            "value": [external_id["external-id-value"] for external_id in flat_ids],
+            "Date de publication": np.array(metadata["Date de publication"], dtype=object)[group_of],
+        }
+        if self.full_works:
+            data["Auteurs"] = np.array([authors for _, authors in ids_and_authors], dtype=object)[group_of]
+        return pd.DataFrame(data=data).sort_values("type", kind="stable").reset_index(drop=True)
+
     def check_id_missing(self) -> tuple[list, list]:
         """
         Vérifie la présence des identifiants dans un DataFrame.
@@ -154,20 +244,20 @@ class Orcid_Researcher:
 
         if self.df_orcid is None:
             return None
-        else:
-            orcid_df_sorted = self.df_orcid.sort_values("type").reset_index(drop=True)
-
-            # Obtenir les types uniques de la colonne 'type' pour créer une colonne par type.
-            types_ids = orcid_df_sorted["type"].unique()
 
-            # Créer une nouvelle colonne pour chaque type d'identification (ex: Orcid, Pubmed Id,WoS etc) et remplir ces colonnes avec les bons IDs.
-            for id_type in types_ids:
-                # Utiliser apply pour remplir chaque colonne en fonction de la condition sur 'type'.
-                orcid_df_sorted[id_type] = orcid_df_sorted.apply(lambda x: x["value"] if x["type"] == id_type else None, axis=1)
+        # df_orcid est déjà trié par type : une colonne par type d'identifiant (ex: Orcid, Pubmed Id, WoS etc),
+        # remplie en une seule affectation avec la valeur de la ligne dans la colonne de son type.
+        orcid_df = self.df_orcid
+        codes, types_ids = pd.factorize(orcid_df["type"], sort=True)
+        rows = np.flatnonzero(codes >= 0)
+        id_values = np.full((len(orcid_df), len(types_ids)), None, dtype=object)
+        id_values[rows, codes[rows]] = orcid_df["value"].to_numpy(dtype=object)[rows]
+        id_columns = pd.DataFrame(id_values, columns=list(types_ids), index=orcid_df.index)
+        orcid_df_sorted = pd.concat([orcid_df.drop(columns=[col for col in types_ids if col in orcid_df.columns]), id_columns], axis=1)
 
-            if to_drop:
-                # On enlève "other-id" et "pmc" parce qu'elles sont négligable et on renomme pour mettre en commun les noms avec WoS.
-                orcid_df_id_col = orcid_df_sorted.drop(to_drop,axis=1).rename(columns=rename_dict)
-            else:
-                orcid_df_id_col = orcid_df_sorted.rename(columns=rename_dict)
-            return orcid_df_id_col
\ No newline at end of file
+        if to_drop:
+            # On enlève "other-id" et "pmc" parce qu'elles sont négligable et on renomme pour mettre en commun les noms avec WoS.
+            orcid_df_id_col = orcid_df_sorted.drop(to_drop,axis=1).rename(columns=rename_dict)
+        else:
+            orcid_df_id_col = orcid_df_sorted.rename(columns=rename_dict)
+        return orcid_df_id_col
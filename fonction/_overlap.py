@@ -0,0 +1,307 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from ._identifiers import ID_PREFIXES
+from ._titles import TITLE_MATCH_THRESHOLD, match_titles
+
+# Colonnes identifiant une œuvre dans sa base (en minuscules) : un export ORCID a une ligne par identifiant
+# externe de chaque œuvre, toutes ces lignes désignent la même publication
+WORK_KEY_COLUMNS = ["orcid path", "put-code"]
+
+class UnionFind:
+    """
+    Structure union-find (ensembles disjoints) sur des enregistrements numérotés de 0 à n - 1.
+
+    Union par taille et compression de chemin par moitié : chaque opération est en temps quasi constant.
+    """
+    def __init__(self, n: int):
+        """
+        Initialise la classe UnionFind.
+
+        Args:
+            n(int) : nombre d'enregistrements
+        """
+        self.parent: np.ndarray = np.arange(n, dtype="int64")
+        self.size: np.ndarray = np.ones(n, dtype="int64")
+
+    def find(self, x: int) -> int:
+        """
+        Renvoie le représentant de l'ensemble contenant x.
+
+        Args:
+            x(int) : numéro d'enregistrement
+
+        Return:
+            int : numéro du représentant
+        """
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union_pairs(self, a: np.ndarray, b: np.ndarray):
+        """
+        Réunit les ensembles de chaque paire (a[i], b[i]).
+
+        Args:
+            a(np.ndarray) : numéros d'enregistrements
+            b(np.ndarray) : numéros d'enregistrements à relier aux premiers
+        """
+        parent, size = self.parent, self.size
+        for x, y in zip(a.tolist(), b.tolist()):
+            x, y = self.find(x), self.find(y)
+            if x == y:
+                continue
+            if size[x] < size[y]:
+                x, y = y, x
+            parent[y] = x
+            size[x] += size[y]
+
+    def roots(self) -> np.ndarray:
+        """
+        Représentant de chaque enregistrement (compression complète, vectorisée).
+
+        Return:
+            np.ndarray : numéro du représentant de chaque enregistrement
+        """
+        parent = self.parent
+        while True:
+            grand_parent = parent[parent]
+            if np.array_equal(grand_parent, parent):
+                return parent
+            parent[:] = grand_parent
+
+def work_codes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Numéro d'œuvre de chaque ligne d'une base, d'après sa colonne WORK_KEY_COLUMNS.
+
+    Args:
+        df(pd.DataFrame) : base de données
+
+    Return:
+        np.ndarray : numéro d'œuvre de chaque ligne (-1 sans clé), ou None si la base n'a pas de telle colonne
+    """
+    columns = {str(col).lower(): col for col in df.columns}
+    column = next((columns[name] for name in WORK_KEY_COLUMNS if name in columns), None)
+    if column is None:
+        return None
+    return pd.factorize(df[column])[0]
+
+def pair_title_matches(source_index, target_index, title_threshold: float = TITLE_MATCH_THRESHOLD) -> pd.DataFrame:
+    """
+    Rapproche par titre les enregistrements de deux bases qui ne partagent aucun identifiant avec l'autre base.
+
+    Le résultat ne dépend que des deux bases (et du seuil) : il peut être gardé d'une comparaison à l'autre.
+
+    Args:
+        source_index(IdIndex) : index de la base source
+        target_index(IdIndex) : index de la base cible
+        title_threshold(float) : similarité minimale des titres
+
+    Return:
+        pd.DataFrame : colonnes "source", "target" (positions) et "confidence" (voir match_titles)
+    """
+    source_long, target_long = source_index.long, target_index.long
+    source_linked = np.zeros(len(source_index.df), dtype=bool)
+    source_linked[source_long.loc[source_long["id"].isin(target_long["id"]), "row"].to_numpy()] = True
+    target_linked = np.zeros(len(target_index.df), dtype=bool)
+    target_linked[target_long.loc[target_long["id"].isin(source_long["id"]), "row"].to_numpy()] = True
+    return match_titles(source_index.titles[~source_linked], target_index.titles[~target_linked], title_threshold)
+
+class PublicationClusters:
+    """
+    Résolution des publications entre toutes les bases de données chargées.
+
+    Les lignes d'une même œuvre dans sa base (ORCID : une ligne par identifiant externe) sont d'abord réunies,
+    quelles que soient les autres bases chargées. Deux enregistrements (de la même base ou de bases différentes)
+    désignent ensuite la même publication s'ils partagent un identifiant, directement ou par transitivité :
+    un article avec un DOI dans HAL, un PMID dans ORCID et les deux dans WoS forme un seul groupe.
+    Les enregistrements restants sont enfin rapprochés par titre (pair_title_matches), paire de bases par paire de bases.
+    Les statistiques se comptent en groupes : deux œuvres d'une base reliées par une autre base (doublons)
+    ne forment qu'une publication.
+
+    Chaque groupe reçoit une clé stable "publication_key" : son identifiant le plus fiable
+    (DOI, puis PubMed, WoS, Scopus, puis le plus petit dans l'ordre alphabétique), ou à défaut
+    "base:ligne" de son premier enregistrement.
+    """
+    def __init__(self, indexes: dict, title_threshold: float = TITLE_MATCH_THRESHOLD, title_matches: dict = None):
+        """
+        Initialise la classe PublicationClusters.
+
+        Args:
+            indexes(dict) : dictionnaire {nom de la base: IdIndex}
+            title_threshold(float) : similarité minimale des titres (None pour ne rapprocher que par identifiant)
+            title_matches(dict) : rapprochements par titre déjà calculés {(source, cible): pair_title_matches} (optionnel)
+        """
+        self.names: list = list(indexes.keys())
+        sizes = np.array([len(index.df) for index in indexes.values()], dtype="int64")
+        self.offsets: dict = dict(zip(self.names, np.concatenate([[0], np.cumsum(sizes)[:-1]]).tolist()))
+        self.sizes: dict = dict(zip(self.names, sizes.tolist()))
+        n_records = int(sizes.sum())
+        record_bit = np.repeat(np.left_shift(1, np.arange(len(self.names), dtype="int64")), sizes)
+
+        self._union_find = UnionFind(n_records)
+
+        # ---- 1. Union des lignes d'une même œuvre, dans chaque base ----
+        for name, index in indexes.items():
+            work = work_codes(index.df)
+            if work is None or not len(work):
+                continue
+            rows = np.arange(len(work), dtype="int64")
+            has_work = work >= 0
+            first_row = np.full(work.max() + 1, len(work), dtype="int64")
+            np.minimum.at(first_row, work[has_work], rows[has_work])
+            same_work = has_work & (first_row[np.maximum(work, 0)] != rows)
+            self._union_find.union_pairs(first_row[work[same_work]] + self.offsets[name], rows[same_work] + self.offsets[name])
+
+        # ---- 2. Union des enregistrements qui partagent un identifiant ----
+        longs = pd.concat(
+            [index.long.assign(row=index.long["row"] + self.offsets[name]) for name, index in indexes.items()],
+            ignore_index=True,
+        ) if self.names else pd.DataFrame({"row": pd.Series(dtype="int64"), "type": pd.Series(dtype=object), "id": pd.Series(dtype=object)})
+        id_code, _ = pd.factorize(longs["id"])
+        record = longs["row"].to_numpy(dtype="int64")
+        # Chaque enregistrement est relié au premier enregistrement portant le même identifiant
+        first = np.full(id_code.max() + 1 if len(id_code) else 0, n_records, dtype="int64")
+        np.minimum.at(first, id_code, record)
+        linked = first[id_code] != record
+        self._union_find.union_pairs(first[id_code][linked], record[linked])
+
+        # ---- 3. Union des enregistrements rapprochés par titre, pour chaque paire de bases ----
+        self.title_matches: dict = {}
+        title_links = []
+        if title_threshold is not None:
+            for source_name, target_name in combinations(self.names, 2):
+                matches = (title_matches or {}).get((source_name, target_name))
+                if matches is None:
+                    matches = pair_title_matches(indexes[source_name], indexes[target_name], title_threshold)
+                self.title_matches[(source_name, target_name)] = matches
+                source_record = matches["source"].to_numpy() + self.offsets[source_name]
+                target_record = matches["target"].to_numpy() + self.offsets[target_name]
+                self._union_find.union_pairs(source_record, target_record)
+                title_links.append(pd.DataFrame({"record": source_record, "confidence": matches["confidence"].to_numpy()}))
+
+        # ---- 4. Groupes, masque des bases et clé de chaque publication ----
+        roots = self._union_find.roots()
+        self.cluster: np.ndarray = pd.factorize(roots)[0] if n_records else np.array([], dtype="int64")
+        n_clusters = int(self.cluster.max()) + 1 if n_records else 0
+
+        self.mask: np.ndarray = np.zeros(n_clusters, dtype="int64")
+        np.bitwise_or.at(self.mask, self.cluster, record_bit)
+
+        # Confiance du groupe : celle de son rapprochement par titre le plus faible (1 si uniquement par identifiant)
+        self.confidence: np.ndarray = np.ones(n_clusters)
+        if title_links:
+            links = pd.concat(title_links, ignore_index=True)
+            np.minimum.at(self.confidence, self.cluster[links["record"].to_numpy(dtype="int64")], links["confidence"].to_numpy())
+
+        self.cluster_keys: np.ndarray = np.full(n_clusters, None, dtype=object)
+        if len(longs):
+            type_rank = longs["type"].map({id_type: rank for rank, id_type in enumerate(ID_PREFIXES)}).to_numpy()
+            best = pd.DataFrame({"cluster": self.cluster[record], "rank": type_rank, "id": longs["id"].to_numpy()})
+            best = best.sort_values(["cluster", "rank", "id"]).drop_duplicates("cluster")
+            self.cluster_keys[best["cluster"].to_numpy()] = best["id"].to_numpy()
+
+        # Groupes sans identifiant : clé "base:ligne" de leur premier enregistrement
+        first_record = np.full(n_clusters, n_records, dtype="int64")
+        np.minimum.at(first_record, self.cluster, np.arange(n_records))
+        missing = np.flatnonzero(pd.isna(self.cluster_keys))
+        starts = np.array(list(self.offsets.values()), dtype="int64")
+        database = np.searchsorted(starts, first_record[missing], side="right") - 1
+        self.cluster_keys[missing] = [f"{self.names[db].lower()}:{record - starts[db]}"
+                                      for db, record in zip(database.tolist(), first_record[missing].tolist())]
+
+    def _rows(self, name: str, values: np.ndarray) -> np.ndarray:
+        """
+        Extrait les valeurs correspondant aux lignes d'une base.
+
+        Args:
+            name(str) : nom de la base
+            values(np.ndarray) : valeurs de tous les enregistrements
+
+        Return:
+            np.ndarray : valeurs des lignes de la base
+        """
+        return values[self.offsets[name]:self.offsets[name] + self.sizes[name]]
+
+    def publication_keys(self, name: str) -> np.ndarray:
+        """
+        Clé de publication de chaque ligne d'une base.
+
+        Args:
+            name(str) : nom de la base
+
+        Return:
+            np.ndarray : publication_key de chaque ligne
+        """
+        return self.cluster_keys[self._rows(name, self.cluster)]
+
+    def clusters_of(self, name: str) -> np.ndarray:
+        """
+        Numéro de groupe de chaque ligne d'une base.
+
+        Args:
+            name(str) : nom de la base
+
+        Return:
+            np.ndarray : numéro de groupe de chaque ligne
+        """
+        return self._rows(name, self.cluster)
+
+    def in_database(self, name: str, other: str) -> np.ndarray:
+        """
+        Indique, pour chaque ligne de la base name, si sa publication est présente dans la base other.
+
+        Args:
+            name(str) : nom de la base
+            other(str) : nom de l'autre base
+
+        Return:
+            np.ndarray : booléen par ligne
+        """
+        bit = 1 << self.names.index(other)
+        return (self.mask[self.clusters_of(name)] & bit) > 0
+
+def compute_overlap(indexes: dict, clusters: PublicationClusters = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Calcule en une seule passe les recoupements entre toutes les bases de données chargées.
+
+    Chaque publication (groupe d'enregistrements résolu par PublicationClusters) porte un masque de bits
+    des bases dans lesquelles elle apparaît. Toutes les intersections (par paires et d'ordre supérieur)
+    sont ensuite déduites de ces masques.
+
+    Args:
+        indexes(dict) : dictionnaire {nom de la base: IdIndex}
+        clusters(PublicationClusters) : résolution déjà calculée (optionnel, sinon par identifiant uniquement)
+
+    Return:
+        tuple[pd.DataFrame, pd.DataFrame] : (publications avec leur clé, leur masque et une colonne booléenne par base,
+            nombre de publications pour chaque combinaison de bases)
+    """
+    clusters = clusters if clusters is not None else PublicationClusters(indexes, title_threshold=None)
+    names = clusters.names
+    mask = clusters.mask
+
+    publications = pd.DataFrame({"publication_key": clusters.cluster_keys, "mask": mask})
+    for bit, name in enumerate(names):
+        publications[name] = (mask & (1 << bit)) > 0
+
+    # Nombre de publications par masque exact, puis pour chaque combinaison de bases
+    exact_counts = pd.Series(mask).value_counts()
+    exact_masks = exact_counts.index.to_numpy()
+    rows = []
+    for size in range(1, len(names) + 1):
+        for combo in combinations(range(len(names)), size):
+            combo_mask = sum(1 << bit for bit in combo)
+            rows.append({
+                "Bases": " & ".join(names[bit] for bit in combo),
+                "Nombre de bases": size,
+                "Publications exclusives": int(exact_counts.get(combo_mask, 0)),
+                "Publications communes": int(exact_counts.to_numpy()[(exact_masks & combo_mask) == combo_mask].sum()),
+            })
+    intersections = pd.DataFrame(rows, columns=["Bases", "Nombre de bases", "Publications exclusives", "Publications communes"])
+
+    return publications, intersections
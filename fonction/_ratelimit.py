@@ -0,0 +1,271 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+from ._endpoints import DEFAULT_BASE_URLS, base_url
+
+# État partagé des limiteurs (fichier SQLite commun à tous les processus : sessions Streamlit et audits
+# en lot se partagent le même débit). Chaîne vide : état propre à chaque processus.
+RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_PATH", os.path.join(".cache", "rate_limits.sqlite"))
+
+# Débit nominal par API, en requêtes par seconde
+RATE_LIMITS = {
+    # Scopus : 9 requêtes par seconde par clé, en plus du quota hebdomadaire (X-RateLimit-*)
+    "scopus": 9,
+    "hal": 10,
+    # ORCID (API publique) : 24 requêtes par seconde par adresse IP
+    "orcid": 24,
+    "orcid-api": 24,
+}
+DEFAULT_RATE_LIMIT = float(os.getenv("DEFAULT_RATE_LIMIT", 50))
+# Débit minimal après des refus successifs (429)
+MIN_RATE = 0.2
+# Attente maximale avant une requête : au-delà (quota épuisé pour longtemps), RateLimitExceeded est levée
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", 60))
+
+class RateLimitExceeded(requests.RequestException):
+    """
+    Quota d'une API épuisé : la prochaine requête ne serait possible qu'après RATE_LIMIT_MAX_WAIT.
+    """
+
+def limiter_key(url: str) -> str:
+    """
+    Limiteur dont relève une adresse : l'API (les quotas sont propres à chaque API, même sur un même hôte),
+    ou le nom d'hôte pour une adresse inconnue.
+
+    Args:
+        url(str) : adresse
+
+    Return:
+        str : nom de l'API ou de l'hôte
+    """
+    for api in DEFAULT_BASE_URLS:
+        if url.startswith(base_url(api) + "/"):
+            return api
+    return urlsplit(url).hostname
+
+def parse_reset(value: str, now: float) -> float:
+    """
+    Date de réinitialisation du quota (X-RateLimit-Reset : date Unix, ou secondes restantes pour certaines API).
+
+    Args:
+        value(str) : valeur de l'en-tête
+        now(float) : date actuelle (secondes)
+
+    Return:
+        float : date de réinitialisation (secondes), ou None si l'en-tête est illisible
+    """
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    return reset if reset > 1e9 else now + reset
+
+def parse_retry_after(value: str, now: float) -> float:
+    """
+    Durée d'attente demandée par Retry-After (secondes ou date HTTP).
+
+    Args:
+        value(str) : valeur de l'en-tête
+        now(float) : date actuelle (secondes)
+
+    Return:
+        float : durée en secondes, ou None si l'en-tête est absent ou illisible
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+class RateLimiter:
+    """
+    Seau à jetons par API, piloté par les réponses : débit nominal (RATE_LIMITS), quota restant
+    (X-RateLimit-Remaining / X-RateLimit-Reset) et refus (429, Retry-After).
+
+    Le seau est tenu sous forme de date théorique de la prochaine requête (GCRA) : chaque requête réserve
+    sa place puis attend son tour, sans interroger l'état en boucle. Après un 429 hors quota, le débit est
+    divisé par deux, puis remonte progressivement vers le débit nominal à chaque réponse acceptée.
+    """
+    def __init__(self, path: str = RATE_LIMIT_PATH):
+        """
+        Initialise la classe RateLimiter.
+
+        Args:
+            path(str) : fichier SQLite de l'état partagé (chaîne vide : état propre au processus)
+        """
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._states = {}
+        if path:
+            try:
+                if os.path.dirname(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._connection().execute("CREATE TABLE IF NOT EXISTS limiters (key TEXT PRIMARY KEY, state TEXT)")
+            except (sqlite3.Error, OSError):
+                # Dossier en lecture seule... : l'état reste propre au processus
+                self.path = ""
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Connexion SQLite propre au fil d'exécution et au processus, sans transaction implicite.
+
+        Return:
+            sqlite3.Connection : connexion
+        """
+        if getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return self._local.connection
+
+    @staticmethod
+    def _initial_state(key: str) -> dict:
+        """
+        État d'un limiteur encore jamais utilisé : débit nominal, sans quota connu ni blocage.
+
+        Args:
+            key(str) : limiteur (limiter_key)
+
+        Return:
+            dict : état (rate, next_at, remaining, reset_at, blocked_until)
+        """
+        return {"rate": RATE_LIMITS.get(key, DEFAULT_RATE_LIMIT), "next_at": 0.0,
+                "remaining": None, "reset_at": 0.0, "blocked_until": 0.0}
+
+    def _update(self, key: str, change):
+        """
+        Lit, modifie et enregistre l'état d'un limiteur en une seule transaction.
+
+        Args:
+            key(str) : limiteur (limiter_key)
+            change : fonction modifiant l'état (dict) sur place et renvoyant un résultat
+
+        Return:
+            résultat de change
+        """
+        if self.path:
+            try:
+                connection = self._connection()
+                # BEGIN IMMEDIATE : un seul processus modifie l'état à la fois
+                connection.execute("BEGIN IMMEDIATE")
+            except sqlite3.Error:
+                connection = None
+            if connection is not None:
+                try:
+                    row = connection.execute("SELECT state FROM limiters WHERE key = ?", (key,)).fetchone()
+                    state = json.loads(row[0]) if row else self._initial_state(key)
+                    result = change(state)
+                    connection.execute("INSERT OR REPLACE INTO limiters VALUES (?, ?)", (key, json.dumps(state)))
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+                return result
+        # Sans fichier partagé (ou base verrouillée trop longtemps) : état propre au processus
+        with self._lock:
+            state = self._states.setdefault(key, self._initial_state(key))
+            return change(state)
+
+    def acquire(self, key: str):
+        """
+        Attend que la prochaine requête vers une API soit autorisée (et la décompte du quota).
+
+        Args:
+            key(str) : limiteur (limiter_key)
+        """
+        def reserve(state: dict) -> tuple[float, bool]:
+            now = time.time()
+            if state["remaining"] is not None and state["reset_at"] <= now:
+                # Nouvelle fenêtre de quota : le restant sera donné par la prochaine réponse
+                state["remaining"] = None
+            start = max(now, state["blocked_until"])
+            if state["remaining"] is not None and state["remaining"] <= 0:
+                start = max(start, state["reset_at"])
+            interval = 1 / state["rate"]
+            # Rafale autorisée : une seconde de débit
+            allowed_at = max(start, state["next_at"] - (max(1.0, state["rate"]) - 1) * interval)
+            if allowed_at - now > RATE_LIMIT_MAX_WAIT:
+                # Pas de réservation : la requête ne sera pas envoyée
+                return allowed_at - now, False
+            state["next_at"] = max(state["next_at"], start) + interval
+            if state["remaining"] is not None:
+                state["remaining"] -= 1
+            return allowed_at - now, True
+
+        wait, reserved = self._update(key, reserve)
+        if not reserved:
+            available = datetime.fromtimestamp(time.time() + wait)
+            raise RateLimitExceeded(f"Quota de l'API {key} épuisé : nouvelles requêtes possibles à partir du "
+                                    f"{available:%d/%m/%Y à %H:%M}.")
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, key: str, response: requests.Response):
+        """
+        Ajuste le limiteur d'après une réponse : quota restant, date de réinitialisation et refus (429).
+
+        Args:
+            key(str) : limiteur (limiter_key)
+            response(requests.Response) : réponse de l'API
+        """
+        nominal = RATE_LIMITS.get(key, DEFAULT_RATE_LIMIT)
+        headers = response.headers
+
+        def update(state: dict):
+            now = time.time()
+            try:
+                remaining = int(headers["X-RateLimit-Remaining"])
+            except (KeyError, TypeError, ValueError):
+                remaining = None
+            reset_at = parse_reset(headers.get("X-RateLimit-Reset"), now)
+            if remaining is not None:
+                if state["remaining"] is None or (reset_at or 0) > state["reset_at"] + 1:
+                    state["remaining"] = remaining
+                else:
+                    # Les requêtes en cours ne sont pas encore décomptées par l'API : le plus petit restant fait foi
+                    state["remaining"] = min(state["remaining"], remaining)
+                state["reset_at"] = reset_at or max(state["reset_at"], now + 60)
+
+            if response.status_code == 429:
+                retry_after = parse_retry_after(headers.get("Retry-After"), now)
+                if state["remaining"] is not None and state["remaining"] <= 0:
+                    # Quota épuisé : rien ne passera avant sa réinitialisation
+                    until = state["reset_at"] if state["reset_at"] > now else now + (retry_after or 1)
+                else:
+                    # Débit trop élevé (clé ou adresse partagée) : le débit est divisé par deux
+                    state["rate"] = max(MIN_RATE, state["rate"] / 2)
+                    until = now + (retry_after if retry_after is not None else 1 / state["rate"])
+                state["blocked_until"] = max(state["blocked_until"], until)
+            elif response.status_code < 400 and state["rate"] < nominal:
+                state["rate"] = min(nominal, state["rate"] + nominal / 20)
+
+        self._update(key, update)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def rate_limiter() -> RateLimiter:
+    """
+    Limiteur partagé par toutes les requêtes du processus (et, par son fichier, par tous les processus).
+
+    Return:
+        RateLimiter : limiteur
+    """
+    with _limiters_lock:
+        if RATE_LIMIT_PATH not in _limiters:
+            _limiters[RATE_LIMIT_PATH] = RateLimiter(RATE_LIMIT_PATH)
+        return _limiters[RATE_LIMIT_PATH]
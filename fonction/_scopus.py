@@ -1,14 +1,57 @@
-import requests
-
+import logging
 import pandas as pd
-import streamlit as st
+import pyarrow.compute as pc
 import os
+import requests
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
+
+from ._endpoints import api_url
+from ._http import http_get
+from ._identifiers import arrow_strings
+
 load_dotenv(".env")
 scopus_api_key = os.getenv("SCOPUS_API_KEY")
 scopus_insttoken = os.getenv("SCOPUS_INSTTOKEN")
 
+logger = logging.getLogger(__name__)
+
+SCOPUS_PAGE_SIZE = 200
+# L'API refuse les pages au-delà de 5000 résultats par décalage (start) : la pagination par curseur prend le relais
+SCOPUS_OFFSET_LIMIT = 5000
+# Nombre de pages demandées en parallèle
+SCOPUS_WORKERS = 4
+# Seuls les champs utilisés sont demandés à l'API (projection côté serveur) : colonne du DataFrame -> champ Scopus
+SCOPUS_FIELDS = {
+    "Titre Publication": "prism:publicationName",
+    "Date de publication": "prism:coverDisplayDate",
+    "pubmed-id": "pubmed-id",
+    "scopus_id": "dc:identifier",
+    "DOI": "prism:doi",
+}
+
+def unique_entries(pages: list) -> list:
+    """
+    Résultats de toutes les pages, sans doublon (même dc:identifier), dans l'ordre des pages.
+
+    Args:
+        pages(list) : résultats de chaque page
+
+    Return:
+        list : résultats distincts (ceux sans identifiant sont tous gardés)
+    """
+    seen, entries = set(), []
+    for page in pages:
+        for entry in page:
+            identifier = entry.get('dc:identifier')
+            if identifier is not None:
+                if identifier in seen:
+                    continue
+                seen.add(identifier)
+            entries.append(entry)
+    return entries
+
 class Scopus_Researcher:
     """
     Cette classe permet de récupérer les données depuis l'API Scopus.
@@ -32,61 +75,139 @@ class Scopus_Researcher:
         self.insttoken = scopus_insttoken
         self.df_scopus: pd.DataFrame = self.error_message()
         
-    def get_scopus_data(self) -> list:
+    def request_page(self, start: int = None, cursor: str = None):
         """
-        Récupère les données depuis l'API Scopus.
-        
+        Demande une page de résultats à l'API Scopus, par décalage ou par curseur.
+
+        Args:
+            start(int) : position du premier résultat (pagination par décalage)
+            cursor(str) : curseur de la page (pagination par curseur, prioritaire)
+
         Return:
-            list : liste des données récupérées
+            requests.Response : réponse de l'API
         """
-        found_items_num: int = 1
-        start_item: int = 0
-        items_per_query: int = 200
-        max_items: int = 1305
-        JSON: list = []
-
-        while found_items_num > 0:
-            resp = requests.get(
-                'https://api.elsevier.com/content/search/scopus',
-                headers={'Accept': 'application/json', 'X-ELS-APIKey': self.api_key},
-                params={
-                    'query': f"AU-ID({self.scopus_id})",
-                    'count': items_per_query,
-                    'start': start_item,
-                    'insttoken': self.insttoken
-                }
-            )
-
-            if resp.status_code != 200:
-                break
-                # raise Exception(f"Scopus API error {resp.status_code}, JSON dump: {resp.json()}")
+        params = {
+            'query': f"AU-ID({self.scopus_id})",
+            'count': SCOPUS_PAGE_SIZE,
+            'field': ",".join(SCOPUS_FIELDS.values()),
+            'insttoken': self.insttoken
+        }
+        if cursor is not None:
+            params['cursor'] = cursor
+        else:
+            params['start'] = start
+        return http_get(
+            api_url("scopus", "content/search/scopus"),
+            headers={'Accept': 'application/json', 'X-ELS-APIKey': self.api_key},
+            params=params
+        )
 
-            if found_items_num == 1:
-                found_items_num = int(resp.json().get('search-results').get('opensearch:totalResults'))
+    def check_response(self, resp, fetched: int, total: int = None):
+        """
+        Lève une erreur si l'API refuse une page (quota, limite de débit, clé invalide...) :
+        les résultats ne sont jamais tronqués sans message.
 
-            if found_items_num == 0:
-                st.error("Nous n'avons pas trouvé d'article pour ce Scopus ID.")
-                break
+        Args:
+            resp(requests.Response) : réponse de l'API
+            fetched(int) : nombre de résultats déjà récupérés
+            total(int) : nombre total de résultats annoncé par l'API (optionnel)
+        """
+        if resp.status_code == 200:
+            return
+        try:
+            body = resp.json()
+            detail = (body.get('service-error', {}).get('status', {}).get('statusText')
+                      or body.get('error-response', {}).get('error-message'))
+        except (ValueError, AttributeError):
+            detail = None
+        detail = detail or resp.headers.get('X-ELS-Status') or resp.reason
+        position = f" après {fetched} résultats sur {total}" if total else ""
+        raise requests.HTTPError(f"Erreur de l'API Scopus ({resp.status_code} : {detail}){position}.", response=resp)
 
-            search_results = resp.json()['search-results']
-            if 'entry' in search_results:
-                JSON += search_results['entry']
+    def cursor_pages(self, total: int, first_page: dict) -> list:
+        """
+        Parcourt tous les résultats avec la pagination par curseur (séquentielle, sans limite de décalage),
+        à partir de la première page déjà reçue.
 
-            start_item += items_per_query
-            found_items_num -= items_per_query
+        Args:
+            total(int) : nombre total de résultats annoncé par l'API
+            first_page(dict) : 'search-results' de la première page (demandée avec le curseur "*")
 
-            if start_item >= max_items:
+        Return:
+            list : résultats de chaque page, dans l'ordre
+        """
+        pages, n_items, cursor, search_results = [], 0, "*", first_page
+        while True:
+            entries = search_results.get('entry', [])
+            if not entries:
+                break
+            pages.append(entries)
+            n_items += len(entries)
+            next_cursor = search_results.get('cursor', {}).get('@next')
+            if n_items >= total or not next_cursor or next_cursor == cursor:
                 break
-        return JSON
+            cursor = next_cursor
+            resp = self.request_page(cursor=cursor)
+            self.check_response(resp, n_items, total)
+            search_results = resp.json()['search-results']
+        return pages
+
+    def get_scopus_data(self) -> list:
+        """
+        Récupère les données depuis l'API Scopus.
+
+        La première page (demandée par curseur) donne le nombre total de résultats ; les pages suivantes sont
+        demandées en parallèle par décalage (SCOPUS_WORKERS à la fois) puis remises dans l'ordre. Rien ne garantit
+        que le curseur et le décalage suivent le même ordre : les résultats sont dédoublonnés (dc:identifier) et,
+        s'il en manque, la suite est parcourue par curseur depuis la première page, comme au-delà de
+        SCOPUS_OFFSET_LIMIT résultats. Une page refusée lève une erreur (voir check_response).
+
+        Return:
+            list : liste des données récupérées
+        """
+        # Le curseur "*" donne la première page avec le curseur de la suivante : elle sert aux deux
+        # paginations sans être redemandée
+        resp = self.request_page(cursor="*")
+        self.check_response(resp, 0)
+
+        search_results = resp.json()['search-results']
+        total = int(search_results.get('opensearch:totalResults', 0))
+        if total == 0:
+            import streamlit as st
+            st.error("Nous n'avons pas trouvé d'article pour ce Scopus ID.")
+            return []
+
+        entries = None
+        if total <= SCOPUS_OFFSET_LIMIT:
+            pages = [search_results.get('entry', [])]
+            starts = range(SCOPUS_PAGE_SIZE, total, SCOPUS_PAGE_SIZE)
+            with ThreadPoolExecutor(max_workers=SCOPUS_WORKERS) as executor:
+                # executor.map renvoie les réponses dans l'ordre des pages
+                for resp in executor.map(lambda start: self.request_page(start=start), starts):
+                    self.check_response(resp, sum(len(page) for page in pages), total)
+                    pages.append(resp.json()['search-results'].get('entry', []))
+            entries = unique_entries(pages)
+            if len(entries) != total:
+                logger.warning("Pagination Scopus par décalage incohérente pour %s (%d résultats sur %d) : "
+                               "parcours par curseur", self.scopus_id, len(entries), total)
+                entries = None
+        if entries is None:
+            entries = unique_entries(self.cursor_pages(total, search_results))
+            if len(entries) != total:
+                logger.warning("Scopus annonce %d résultats pour %s, %d récupérés", total, self.scopus_id, len(entries))
+        return entries
 
     def error_message(self):
+        # Streamlit n'est importé que pour afficher les erreurs : le module reste utilisable sans interface
         try:
             int_scopus_id = int(self.scopus_id)
         except ValueError:
+            import streamlit as st
             st.write("Pour Scopus :")
             return st.error("Veuillez renseigner un Scopus ID sans lettre.")
 
         if self.scopus_id == "":
+            import streamlit as st
             st.write("Pour Scopus :1")
             return st.error("Veuillez renseigner un Scopus ID.")
         
@@ -102,31 +223,17 @@ class Scopus_Researcher:
         """
         if isinstance(self.df_scopus, list):
             scopus_articles = self.df_scopus
-            data_list = []
-            for articles in scopus_articles:
-                data_list.append({
-                    "Titre Publication": articles["prism:publicationName"],
-                    "Date de publication": articles["prism:coverDisplayDate"],
-                    "pubmed-id": articles.get("pubmed-id", None),
-                    "scopus_id": articles["dc:identifier"],
-                    "DOI": articles.get("prism:doi", "")
-                })
-            df = pd.DataFrame(data=data_list)
-            
-            def extract_last_or_full(x:str) -> str:
-                """
-                Extrait le dernier mot ou la première phrase si le dernier mot n'est pas un nombre.
-                
-                Args:
-                    x (str): La chaîne de caractères à traiter.
-                    
-                Returns:
-                    str: Le dernier mot ou la première phrase si le dernier mot n'est pas un nombre.
-                """
-                words = x.split(" ")
-                return words[-1] if words[-1].isdigit() else x.split(" ")[0]
-            
-            df["Date de publication"] = df["Date de publication"].apply(extract_last_or_full)
+            # Construction directe des colonnes (le DOI absent vaut "", les autres champs absents None)
+            df = pd.DataFrame({
+                column: [articles.get(field, "" if column == "DOI" else None) for articles in scopus_articles]
+                for column, field in SCOPUS_FIELDS.items()
+            })
+
+            # Date : le dernier mot s'il s'agit d'un nombre (l'année de "12 March 2020"), sinon le premier mot
+            dates = arrow_strings(df["Date de publication"])
+            first_word = pc.list_element(pc.split_pattern(dates, " ", max_splits=1), 0)
+            last_word = pc.utf8_reverse(pc.list_element(pc.split_pattern(pc.utf8_reverse(dates), " ", max_splits=1), 0))
+            df["Date de publication"] = pc.if_else(pc.utf8_is_digit(last_word), last_word, first_word).to_numpy(zero_copy_only=False)
 
             return df
         else:
@@ -0,0 +1,248 @@
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+
+from ._identifiers import arrow_strings
+
+# Similarité minimale (Jaccard sur les trigrammes du titre) pour accepter une correspondance par titre
+TITLE_MATCH_THRESHOLD = 0.8
+# Écart maximal entre les années de publication (publication en ligne puis papier)
+YEAR_TOLERANCE = 1
+
+# Paramètres du MinHash LSH : NUM_BANDS bandes de BAND_ROWS valeurs
+NUM_BANDS = 8
+BAND_ROWS = 4
+SHINGLE_SIZE = 3
+# Au-delà de cette taille, un compartiment regroupe des titres génériques (« Editorial », « Reply »...) : il est ignoré
+MAX_BUCKET_SIZE = 64
+
+# Famille de hachage universelle (a * x + b) mod p : avec p = 2^31 - 1 et a, b, x < p,
+# le produit tient sur 64 bits (pas de débordement avant le modulo)
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20240601)
+_HASH_A = _rng.integers(1, (1 << 31) - 1, NUM_BANDS * BAND_ROWS, dtype=np.uint64)
+_HASH_B = _rng.integers(0, (1 << 31) - 1, NUM_BANDS * BAND_ROWS, dtype=np.uint64)
+
+YEAR_COLUMNS = ["Publication Year", "year", "Year", "Date de publication", "publicationDate_s", "Date"]
+
+def find_title_columns(df: pd.DataFrame) -> dict:
+    """
+    Identifie les colonnes du titre de l'article, de l'année et du journal.
+
+    Args:
+        df(pd.DataFrame) : DataFrame à analyser.
+
+    Return:
+        dict : dictionnaire {"title": ..., "year": ..., "journal": ...} (None si la colonne est absente)
+    """
+    mapping = {"title": None, "year": None, "journal": None}
+    titles = []
+    for col in df.columns:
+        if not isinstance(col, str):
+            continue
+        col_lower = col.lower()
+
+        if ("title" in col_lower or "titre" in col_lower) and not any(
+                term in col_lower for term in ["journal", "source", "book", "series", "conference", "publication"]):
+            titles.append(col)
+        elif mapping["journal"] is None and any(
+                term in col_lower for term in ["journal", "source title", "titre publication", "nom publication"]):
+            mapping["journal"] = col
+
+    # On privilégie les colonnes qui désignent explicitement l'article
+    titles.sort(key=lambda col: "article" not in col.lower())
+    mapping["title"] = titles[0] if titles else None
+    mapping["year"] = next((col for col in YEAR_COLUMNS if col in df.columns), None)
+    return mapping
+
+def normalize_text_series(values: pd.Series) -> pd.Series:
+    """
+    Normalise des titres : minuscules, sans accents ni ponctuation, espaces simples.
+
+    Args:
+        values(pd.Series) : titres bruts.
+
+    Return:
+        pd.Series : titres normalisés (string[pyarrow]).
+    """
+    array = arrow_strings(values)
+    array = pc.utf8_lower(pc.utf8_normalize(array, "NFKD"))
+    array = pc.replace_substring_regex(array, r"\p{Mn}", "")
+    array = pc.replace_substring_regex(array, r"[^\p{L}\p{N}]+", " ")
+    array = pc.utf8_trim_whitespace(array)
+    normalized = pd.Series(pd.arrays.ArrowStringArray(array), index=values.index)
+    return normalized.mask(normalized == "")
+
+def extract_year_series(values: pd.Series) -> pd.Series:
+    """
+    Extrait l'année (4 chiffres) d'une colonne de dates.
+
+    Args:
+        values(pd.Series) : dates ou années.
+
+    Return:
+        pd.Series : années (Int64).
+    """
+    years = values.astype("string[pyarrow]").str.extract(r"((?:1[89]|20)\d{2})", expand=False)
+    return pd.to_numeric(years, errors="coerce").astype("Int64")
+
+def title_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prépare les informations utilisées pour la correspondance par titre.
+
+    Args:
+        df(pd.DataFrame) : base de données.
+
+    Return:
+        pd.DataFrame : colonnes "title", "year" et "journal" normalisées (une ligne par ligne de df).
+    """
+    columns = find_title_columns(df)
+    features = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    for key, normalize in [("title", normalize_text_series), ("journal", normalize_text_series), ("year", extract_year_series)]:
+        col = columns[key]
+        if col is None:
+            features[key] = pd.Series(pd.NA, index=features.index, dtype="Int64" if key == "year" else "string[pyarrow]")
+        else:
+            features[key] = normalize(df[col].reset_index(drop=True))
+    return features
+
+def _grams(titles: pd.Series) -> list:
+    """
+    Découpe chaque titre en ensemble de trigrammes de caractères.
+
+    Args:
+        titles(pd.Series) : titres normalisés (sans valeur manquante).
+
+    Return:
+        list : ensemble de trigrammes par titre
+    """
+    return [{title[i:i + SHINGLE_SIZE] for i in range(max(1, len(title) - SHINGLE_SIZE + 1))} for title in titles.tolist()]
+
+def _hash_grams(grams: list) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Aplatit les trigrammes de tous les titres et les hache.
+
+    Args:
+        grams(list) : ensemble de trigrammes par titre
+
+    Return:
+        tuple[np.ndarray, np.ndarray] : position du titre et hachage de chaque trigramme.
+    """
+    owner = np.repeat(np.arange(len(grams)), [len(title_grams) for title_grams in grams])
+    flat = np.fromiter((gram for title_grams in grams for gram in title_grams), dtype=object, count=len(owner))
+    return owner, pd.util.hash_array(flat)
+
+def _minhash(owner: np.ndarray, hashes: np.ndarray, n_titles: int) -> np.ndarray:
+    """
+    Calcule la signature MinHash de chaque titre.
+
+    Args:
+        owner(np.ndarray) : position du titre de chaque trigramme (triée)
+        hashes(np.ndarray) : hachage de chaque trigramme
+        n_titles(int) : nombre de titres
+
+    Return:
+        np.ndarray : signatures (n_titles x NUM_BANDS * BAND_ROWS)
+    """
+    signatures = np.empty((n_titles, len(_HASH_A)), dtype=np.uint64)
+    starts = np.searchsorted(owner, np.arange(n_titles))
+    hashes = hashes % _MERSENNE_PRIME
+    for j, (a, b) in enumerate(zip(_HASH_A, _HASH_B)):
+        permuted = (a * hashes + b) % _MERSENNE_PRIME
+        signatures[:, j] = np.minimum.reduceat(permuted, starts)
+    return signatures
+
+def _jaccard(grams_a: list, grams_b: list) -> np.ndarray:
+    """
+    Similarité de Jaccard exacte entre des paires d'ensembles.
+
+    Args:
+        grams_a(list) : ensembles de trigrammes
+        grams_b(list) : ensembles de trigrammes correspondants
+
+    Return:
+        np.ndarray : similarité de chaque paire
+    """
+    return np.array([len(a & b) / len(a | b) if a or b else 0.0 for a, b in zip(grams_a, grams_b)])
+
+def match_titles(source: pd.DataFrame, target: pd.DataFrame, threshold: float = TITLE_MATCH_THRESHOLD) -> pd.DataFrame:
+    """
+    Recherche les publications communes par titre, année et journal.
+
+    Les paires candidates sont obtenues par MinHash LSH (des titres proches tombent dans un même
+    compartiment) : le travail reste proche du linéaire au lieu de comparer toutes les paires.
+    Seules les paires candidates sont vérifiées (Jaccard exact sur les trigrammes, écart d'années).
+
+    Args:
+        source(pd.DataFrame) : caractéristiques des lignes source à rapprocher (title_features), index = position.
+            Une colonne booléenne "has_ids" optionnelle exclut les paires où les deux lignes ont des identifiants.
+        target(pd.DataFrame) : caractéristiques des lignes cible à rapprocher (title_features), index = position
+        threshold(float) : similarité minimale pour retenir une correspondance
+
+    Return:
+        pd.DataFrame : colonnes "source", "target" (positions) et "confidence", au plus une correspondance par ligne.
+    """
+    empty = pd.DataFrame({"source": pd.Series(dtype="int64"), "target": pd.Series(dtype="int64"), "confidence": pd.Series(dtype="float64")})
+    source = source[source["title"].notna()]
+    target = target[target["title"].notna()]
+    if source.empty or target.empty:
+        return empty
+
+    # ---- 1. Signatures MinHash de tous les titres ----
+    titles = pd.concat([source["title"], target["title"]], ignore_index=True)
+    grams = _grams(titles)
+    owner, hashes = _hash_grams(grams)
+    signatures = _minhash(owner, hashes, len(titles))
+
+    # ---- 2. Compartiments LSH : une clé par bande ----
+    keys = []
+    for band in range(NUM_BANDS):
+        band_values = signatures[:, band * BAND_ROWS:(band + 1) * BAND_ROWS]
+        keys.append(pd.util.hash_pandas_object(pd.DataFrame(band_values), index=False).to_numpy())
+    buckets = pd.DataFrame({
+        "band": np.repeat(np.arange(NUM_BANDS), len(titles)),
+        "key": np.concatenate(keys),
+        "position": np.tile(np.arange(len(titles)), NUM_BANDS),
+    })
+    buckets = buckets[buckets.groupby(["band", "key"])["position"].transform("size") <= MAX_BUCKET_SIZE]
+    n_source = len(source)
+    source_buckets = buckets[buckets["position"] < n_source]
+    target_buckets = buckets[buckets["position"] >= n_source]
+
+    # ---- 3. Paires candidates : même compartiment dans au moins une bande ----
+    candidates = source_buckets.merge(target_buckets, on=["band", "key"], suffixes=("_source", "_target"))
+    candidates = candidates[["position_source", "position_target"]].drop_duplicates()
+    if candidates.empty:
+        return empty
+
+    # ---- 4. Vérification des candidates : titre, année, journal ----
+    src = source.iloc[candidates["position_source"].to_numpy()].reset_index()
+    tgt = target.iloc[candidates["position_target"].to_numpy() - n_source].reset_index()
+
+    title_sim = _jaccard([grams[i] for i in candidates["position_source"]], [grams[i] for i in candidates["position_target"]])
+
+    both_journals = (src["journal"].notna() & tgt["journal"].notna()).to_numpy()
+    journal_sim = np.zeros(len(src))
+    if both_journals.any():
+        journal_sim[both_journals] = _jaccard(_grams(src.loc[both_journals, "journal"]), _grams(tgt.loc[both_journals, "journal"]))
+    # Le journal, quand il est connu des deux côtés, compte pour un cinquième de la confiance
+    confidence = np.where(both_journals, 0.8 * title_sim + 0.2 * journal_sim, title_sim)
+
+    year_gap = (src["year"] - tgt["year"]).abs()
+    year_ok = (year_gap.isna() | (year_gap <= YEAR_TOLERANCE)).to_numpy(dtype=bool)
+
+    # Deux publications identifiées toutes les deux sont déjà départagées par leurs identifiants
+    allowed = np.ones(len(src), dtype=bool)
+    if "has_ids" in src.columns and "has_ids" in tgt.columns:
+        allowed = ~(src["has_ids"].to_numpy(dtype=bool) & tgt["has_ids"].to_numpy(dtype=bool))
+
+    matches = pd.DataFrame({
+        "source": src["index"].to_numpy(dtype="int64"),
+        "target": tgt["index"].to_numpy(dtype="int64"),
+        "confidence": confidence,
+    })[year_ok & allowed & (confidence >= threshold)]
+
+    # ---- 5. Une seule correspondance par ligne, la plus sûre en premier ----
+    matches = matches.sort_values("confidence", ascending=False, kind="stable")
+    matches = matches.drop_duplicates("source").drop_duplicates("target")
+    return matches.reset_index(drop=True)
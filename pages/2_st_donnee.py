@@ -5,7 +5,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from os import path
-from fonction import get_hal_researcher_data, Orcid_Researcher, Scopus_Researcher
+from fonction import get_hal_researcher_data, Orcid_Researcher, Scopus_Researcher, fetch_sources
 from utilitaire import reset_session, reach_st_show_donnee, read_markdown_file
 
 st.title("Récupération des données")
@@ -162,56 +162,62 @@ else:
         if len(check_list) < 2:
             st.error("Veuillez renseigner au moins deux bases de données.")
         else:
-            # Récupération des données
-            with st.spinner(""):
-                bar_perc = 0
-                progress_bar = empty.progress(bar_perc, text="Recherche des données orcid en cours...")
-                
-                # Récupération des données ORCID
-                if st.session_state.orcid_researcher:
-                    orcid_df = Orcid_Researcher(orcid_link=orcid_researcher).format_df_orcids()
+            # Les trois bases sont interrogées en parallèle ; les saisies sont vérifiées ici,
+            # les messages Streamlit émis depuis les fils de récupération n'étant pas affichés.
+            fetchers = {}
+            orcid_link = st.session_state.get("orcid_researcher")
+            if orcid_link:
+                if "https://orcid.org/" in orcid_link:
+                    fetchers["Orcid"] = lambda: Orcid_Researcher(orcid_link=orcid_link).format_df_orcids()
                 else:
-                    pass
-                
-                bar_perc += 1
-                progress_bar.progress(bar_perc / 3, text="Recherche des données HAL en cours...") 
-                
+                    st.error("Pour Orcid : l'URL doit contenir https://orcid.org/")
+
+            hal_id = st.session_state.get("id_hal") if st.session_state.get("search_by") == "ID HAL" else None
+            hal_last_name = st.session_state.get("researcher_last_name")
+            hal_first_name = st.session_state.get("researcher_first_name")
+            if hal_id or (hal_last_name and hal_first_name):
+                fetchers["HAL"] = lambda: get_hal_researcher_data(hal_last_name, hal_first_name, hal_id)
 
-                if st.session_state["id_hal"]:
-                    hal_df = get_hal_researcher_data(idhal=id_hal)
+            # Récupération des données Scopus
+            if os.getenv("SCOPUS_API_KEY") != "YOUR_SCOPUS_API_KEY":
+                scopus_id = st.session_state.get("scopus_id")
+                if scopus_id:
+                    if not scopus_id.isdigit():
+                        st.error("Pour Scopus : veuillez renseigner un Scopus ID sans lettre.")
+                    elif len(scopus_id) >= 10:
+                        fetchers["Scopus"] = lambda: Scopus_Researcher(scopus_id=scopus_id).get_publication_scopus()
+                    else:
+                        st.error("Le Scopus ID doit contenir au moins 10 chiffres.")
+
+            # Avancement et erreurs par base
+            status = {source: st.empty() for source in fetchers}
+            for source, placeholder in status.items():
+                placeholder.info(f"{source} : récupération en cours...")
+            progress_bar = empty.progress(0.0, text="Récupération des données en cours...")
+            done = []
+
+            def report(source: str, df: pd.DataFrame, error: str, elapsed: float):
+                done.append(source)
+                if error:
+                    status[source].error(f"{source} : {error}")
+                elif df.empty:
+                    status[source].warning(f"{source} : aucune publication trouvée ({elapsed:.1f} s)")
                 else:
-                    hal_df = get_hal_researcher_data(researcher_last_name, researcher_first_name, id_hal)
+                    status[source].success(f"{source} : {len(df)} publications récupérées ({elapsed:.1f} s)")
+                progress_bar.progress(len(done) / len(fetchers), text=f"{len(done)}/{len(fetchers)} bases récupérées")
 
+            with st.spinner(""):
+                fetched, errors = fetch_sources(fetchers, progress=report)
 
-                bar_perc += 1
-                progress_bar.progress(bar_perc/ 3, text="Recherche des données Scopus en cours...") 
-                
-                # Récupération des données Scopus
-                if os.getenv("SCOPUS_API_KEY") != "YOUR_SCOPUS_API_KEY":
-                    if st.session_state["scopus_id"]:
-                        if len(scopus_id) == 0:
-                            st.error("Veuillez renseigner un Scopus ID.")
-                        elif len(scopus_id) >= 10:
-                            scopus_df = Scopus_Researcher(scopus_id=scopus_id).get_publication_scopus()
-                        else:
-                            st.error("Le Scopus ID doit contenir au moins 10 chiffres.")
-                    else:
-                        # st.write("pas de données scopus")
-                        pass
-                bar_perc += 1
-                progress_bar.progress(bar_perc / 3,text="Recherche des données en cours...") 
-            
             # Ajout des données dans la base de données
-            if st.session_state.id_hal:
-                databases["HAL"] = hal_df
-            if os.getenv("SCOPUS_API_KEY") != "YOUR_SCOPUS_API_KEY":
-                if st.session_state.scopus_id:
-                    databases["Scopus"] = scopus_df # if "Publication Scopus" not in list(databases.keys()) else databases["Publication Scopus"]
-                else:
-                    pass
-            if st.session_state.orcid_researcher:
-                databases["Orcid"] = orcid_df
-            st.success("Données chargées avec succès.")
+            # Le bilan porte sur toutes les bases (fichiers téléversés compris), les erreurs sur les seules récupérations
+            databases.update(fetched)
+            if not databases:
+                st.error("Aucune donnée n'a pu être récupérée.")
+            elif errors:
+                st.warning(f"Données chargées, sauf pour : {', '.join(errors)}.")
+            else:
+                st.success("Données chargées avec succès.")
         empty.empty()
 
         st.session_state["databases"] = databases
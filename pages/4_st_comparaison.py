@@ -1,6 +1,6 @@
 import streamlit as st
 
-from fonction import compare_all_databases
+from fonction import compare_all_databases, TITLE_MATCH_THRESHOLD
 
 from utilitaire import reset_session, reach_st_donnee, download_plot, download_all_plots
 
@@ -21,7 +21,12 @@ if "databases" not in st.session_state.keys():
     st.error("Veuillez téléverser au moins deux bases de données pour effectuer une comparaison.")
     reach_st_donnee(message = "Revenir à l'importation des données", type_button = 'secondary')
 else:
-    compare_all_databases(st.session_state["databases"])
+    title_threshold = st.slider(
+        "Similarité minimale des titres (publications sans identifiant commun)",
+        min_value=0.5, max_value=1.0, value=TITLE_MATCH_THRESHOLD, step=0.05,
+        help="Les publications sans DOI, PMID, WoS ou EID communs sont rapprochées par titre, année et journal. La colonne match_confidence indique la confiance de chaque correspondance (1 pour un identifiant commun).",
+    )
+    compare_all_databases(st.session_state["databases"], title_threshold=title_threshold)
     
 # Si des graphiques sont disponibles
 if "plot_venn_diagram" in st.session_state.keys():
@@ -0,0 +1,73 @@
+"""
+Tests de l'audit en lot hors ligne (run_batch avec LocalFetcher) sur un petit roster et des exports synthétiques.
+
+Utilisation (depuis la racine du projet) :
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fonction._batch import LocalFetcher, read_roster, run_batch
+
+@pytest.fixture
+def exports(tmp_path) -> str:
+    """
+    Dossier d'exports locaux : HAL et Scopus pour jdupont (trois publications dont deux communes).
+    """
+    pd.DataFrame({
+        "Titre Article": ["Étude A", "Étude B", "Étude C"],
+        "DOI": ["10.1000/a", "https://doi.org/10.1000/B", "10.1000/c"],
+    }).to_csv(tmp_path / "hal_jdupont.csv", index=False)
+    pd.DataFrame({
+        "Titre Article": ["Étude A", "Étude B"],
+        "DOI": ["10.1000/a", "10.1000/b"],
+    }).to_csv(tmp_path / "scopus_7000000001.csv", index=False)
+    return str(tmp_path)
+
+@pytest.fixture
+def roster(tmp_path) -> pd.DataFrame:
+    roster_path = tmp_path / "chercheurs.csv"
+    roster_path.write_text(
+        "nom,prenom,idhal,orcid,scopus_id\n"
+        "Dupont,Jean,jdupont,,7000000001\n"
+        "Martin,Alice,,0000-0001-0000-0001,\n"
+        "Durand,Paul,,,\n",
+        encoding="utf-8",
+    )
+    return read_roster(str(roster_path))
+
+def test_run_batch_offline(exports, roster):
+    coverage = run_batch(roster, fetcher=LocalFetcher(exports), workers=2, title_threshold=None)
+    assert coverage["Chercheur"].tolist() == ["Jean Dupont", "Alice Martin", "Paul Durand"]
+
+    dupont = coverage.iloc[0]
+    assert dupont["Publications uniques"] == 3
+    assert dupont["Publications HAL"] == 3
+    assert dupont["Publications Scopus"] == 2
+    assert dupont["Couverture Scopus (%)"] == pytest.approx(66.67)
+    assert pd.isna(dupont["Erreurs"])
+
+def test_run_batch_offline_reports_errors(exports, roster):
+    coverage = run_batch(roster, fetcher=LocalFetcher(exports), workers=2, title_threshold=None)
+
+    # Export absent
+    martin = coverage.iloc[1]
+    assert martin["Publications uniques"] == 0
+    assert "aucun export orcid_0000-0001-0000-0001" in martin["Erreurs"]
+
+    # Chercheur connu par son seul nom : pas d'export HAL possible
+    durand = coverage.iloc[2]
+    assert durand["Publications uniques"] == 0
+    assert "HAL" in durand["Erreurs"] and "idhal" in durand["Erreurs"]
+
+def test_run_batch_reports_unreadable_export(exports, roster):
+    with open(os.path.join(exports, "scopus_7000000001.csv"), "w", encoding="utf-8") as file:
+        file.write("")
+    coverage = run_batch(roster.iloc[:1], fetcher=LocalFetcher(exports), workers=1, title_threshold=None)
+    assert coverage["Chercheur"].tolist() == ["Jean Dupont"]
+    assert coverage.iloc[0]["Erreurs"]
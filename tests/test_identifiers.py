@@ -0,0 +1,23 @@
+"""
+Tests de la normalisation des identifiants.
+
+Utilisation (depuis la racine du projet) :
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fonction._identifiers import normalize_pmid_series
+
+def test_pmid_strings_must_be_whole_integers():
+    values = pd.Series(["PMID: 123", " 77 ", "123.0", "12.5", "PMC123/456", "abc 12", "0", "99999999999999999999", None])
+    assert normalize_pmid_series(values).tolist() == [123, 77, 123, pd.NA, pd.NA, pd.NA, pd.NA, pd.NA, pd.NA]
+
+def test_pmid_numbers_and_strings_agree():
+    numbers = pd.Series([123.0, 12.5, -3.0, 1e30])
+    strings = pd.Series(["123", "12.5", "-3", "1e30"])
+    assert normalize_pmid_series(numbers).tolist() == normalize_pmid_series(strings).tolist() == [123, pd.NA, pd.NA, pd.NA]
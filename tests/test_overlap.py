@@ -0,0 +1,73 @@
+"""
+Tests de la résolution des publications (PublicationClusters) : les lignes d'une œuvre ORCID forment une
+seule publication et les statistiques de chaque paire se comptent dans les mêmes groupes.
+
+Utilisation (depuis la racine du projet) :
+    python -m pytest tests
+"""
+import os
+import sys
+from itertools import combinations
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fonction._comparison import ComparisonResult
+
+RESSOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ressources")
+EXPORTS = {
+    "HAL": "hal_humbert.xlsx",
+    "Scopus": "scopus_mh.xlsx",
+    "Orcid": "orcid_publication.xlsx",
+    "WoS": "Marc Humbert WoS.xlsx",
+}
+
+@pytest.fixture(scope="module")
+def exports() -> dict:
+    return {name: pd.read_excel(os.path.join(RESSOURCES, file)) for name, file in EXPORTS.items()}
+
+def orcid_counts(result: ComparisonResult) -> set:
+    """
+    Nombres de publications ORCID affichés par toutes les paires d'une comparaison.
+    """
+    counts = set()
+    for pair in result.pairs.values():
+        if pair.source_name == "Orcid":
+            counts.add(pair.n_source)
+        if pair.target_name == "Orcid":
+            counts.add(pair.n_target)
+    return counts
+
+def test_pair_counts_are_consistent_whichever_databases_are_loaded(exports):
+    n_works = exports["Orcid"]["orcid path"].nunique()
+    others = [name for name in EXPORTS if name != "Orcid"]
+    for size in range(1, len(others) + 1):
+        for combo in combinations(others, size):
+            databases = {name: exports[name] for name in ("Orcid", *combo)}
+            result = ComparisonResult(databases, title_threshold=None)
+            # Une seule valeur par comparaison, jamais plus que d'œuvres ORCID (les lignes d'une œuvre ne comptent qu'une fois)
+            counts = orcid_counts(result)
+            assert len(counts) == 1 and counts.pop() <= n_works, combo
+            for pair in result.pairs.values():
+                assert pair.n_common + pair.n_only_source == pair.n_source, (combo, pair.source_name, pair.target_name)
+                assert pair.n_common + pair.n_only_target == pair.n_target, (combo, pair.source_name, pair.target_name)
+
+def test_rows_of_one_orcid_work_share_a_publication_key(exports):
+    result = ComparisonResult({"HAL": exports["HAL"], "Orcid": exports["Orcid"]})
+    keys = pd.DataFrame({"work": exports["Orcid"]["orcid path"], "key": result.clusters.publication_keys("Orcid")})
+    assert (keys.groupby("work")["key"].nunique() == 1).all()
+
+def test_rows_of_one_orcid_work_are_united_without_other_link():
+    # Deux lignes de la même œuvre (DOI et PMID différents), aucune autre base ne les relie
+    orcid = pd.DataFrame({
+        "Titre Article": ["Étude A", "Étude A", "Étude B"],
+        "Orcid path": ["/0000/work/1", "/0000/work/1", "/0000/work/2"],
+        "type": ["doi", "pmid", "doi"],
+        "value": ["10.1/a", "123", "10.1/b"],
+    })
+    hal = pd.DataFrame({"Titre Article": ["Étude C"], "DOI": ["10.1/c"]})
+    result = ComparisonResult({"HAL": hal, "Orcid": orcid}, title_threshold=None)
+    assert result.pairs["HAL_Orcid"].n_target == 2
+    assert len(set(result.clusters.publication_keys("Orcid"))) == 2